@@ -0,0 +1,130 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+from utils import load_data
+
+SCORE_BATCH_SIZE = 100_000
+TREND_WINDOW_DAYS = 30
+
+
+def _sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -35, 35)))
+
+
+def build_features(master_df, sessions_df, as_of=None):
+    """One feature row per user, measured up to the user's reference date.
+
+    The reference date is the churn date for churned users and `as_of` (latest session by default)
+    for everyone else, so churned and active users are described over comparable history.
+    Features: recency, watch-time trend (last 30 days vs the 30 before), activity volume, tenure,
+    trial/converted flags, and each user's device and genre mix as watch-time shares.
+    """
+    if as_of is None:
+        as_of = sessions_df['session_date'].max() if not sessions_df.empty else pd.Timestamp.now(tz='Asia/Kolkata')
+
+    users = master_df[['user_id', 'country', 'join_date', 'churn_date', 'is_trial', 'converted']].copy()
+    users['ref_date'] = users['churn_date'].fillna(as_of)
+    users['is_churned'] = users['churn_date'].notnull()
+
+    sessions = sessions_df[['user_id', 'session_date', 'watch_time_min', 'device_type', 'content_genre']].copy()
+    sessions['ref_date'] = sessions['user_id'].map(users.set_index('user_id')['ref_date'])
+    # Whole calendar days, so sessions on the churn day itself (churn_date is midnight) count as day 0
+    sessions['days_before'] = (sessions['ref_date'].dt.normalize() - sessions['session_date'].dt.normalize()).dt.days
+    sessions = sessions[sessions['days_before'] >= 0]
+
+    # Activity, recency and watch-time trend in one groupby
+    sessions['recent_watch'] = sessions['watch_time_min'].where(sessions['days_before'] < TREND_WINDOW_DAYS, 0)
+    sessions['prior_watch'] = sessions['watch_time_min'].where(
+        sessions['days_before'].between(TREND_WINDOW_DAYS, 2 * TREND_WINDOW_DAYS - 1), 0)
+    activity = sessions.groupby('user_id').agg(
+        recency_days=('days_before', 'min'),
+        total_sessions=('days_before', 'size'),
+        recent_watch=('recent_watch', 'sum'),
+        prior_watch=('prior_watch', 'sum'),
+    )
+
+    # Device and genre mix as shares of each user's watch time
+    device_mix = sessions.pivot_table(index='user_id', columns='device_type', values='watch_time_min', aggfunc='sum', fill_value=0)
+    genre_mix = sessions.pivot_table(index='user_id', columns='content_genre', values='watch_time_min', aggfunc='sum', fill_value=0)
+    device_share = device_mix.div(device_mix.sum(axis=1).replace(0, 1), axis=0).add_prefix('device_')
+    genre_share = genre_mix.div(genre_mix.sum(axis=1).replace(0, 1), axis=0).add_prefix('genre_')
+
+    users = users.set_index('user_id').join([activity, device_share, genre_share])
+    # Users with no sessions before their reference date are maximally stale
+    users['recency_days'] = users['recency_days'].fillna((users['ref_date'] - users['join_date']).dt.days.clip(lower=0))
+    users = users.fillna({'total_sessions': 0, 'recent_watch': 0, 'prior_watch': 0})
+    users = users.fillna({c: 0 for c in users.columns if c.startswith(('device_', 'genre_'))})
+
+    users['log_recency'] = np.log1p(users['recency_days'])
+    users['log_sessions'] = np.log1p(users['total_sessions'])
+    users['watch_trend'] = (users['recent_watch'] - users['prior_watch']) / (users['prior_watch'] + users['recent_watch'] + 1)
+    users['log_tenure'] = np.log1p((users['ref_date'] - users['join_date']).dt.days.clip(lower=0))
+    users['trial'] = users['is_trial'].astype(float)
+    users['converted_flag'] = users['converted'].astype(float)
+    users['dominant_device'] = device_mix.idxmax(axis=1).reindex(users.index)
+    users['top_genre'] = genre_mix.idxmax(axis=1).reindex(users.index)
+
+    feature_cols = ['log_recency', 'log_sessions', 'watch_trend', 'log_tenure', 'trial', 'converted_flag'] + \
+        list(device_share.columns) + list(genre_share.columns)
+    return users.reset_index(), feature_cols
+
+
+def fit_logistic(X, y, l2=1.0, max_iter=25, tol=1e-6):
+    """L2-regularised logistic regression fitted with Newton's method (IRLS).
+
+    X is standardised internally; returns (weights, bias, mean, std) for use with score_batches.
+    """
+    mean = X.mean(axis=0)
+    std = X.std(axis=0)
+    std[std == 0] = 1.0
+    Xs = np.hstack([(X - mean) / std, np.ones((len(X), 1))])
+
+    w = np.zeros(Xs.shape[1])
+    penalty = np.full(Xs.shape[1], l2)
+    penalty[-1] = 0.0  # leave the bias unregularised
+    for _ in range(max_iter):
+        p = _sigmoid(Xs @ w)
+        grad = Xs.T @ (p - y) + penalty * w
+        hess = (Xs * (p * (1 - p))[:, None]).T @ Xs + np.diag(penalty)
+        step = np.linalg.solve(hess, grad)
+        w -= step
+        if np.abs(step).max() < tol:
+            break
+    return w[:-1], w[-1], mean, std
+
+
+def score_batches(X, model, batch_size=SCORE_BATCH_SIZE):
+    """Churn probability for every row of X, one matrix-vector product per batch"""
+    weights, bias, mean, std = model
+    scaled_weights = weights / std
+    offset = bias - mean @ scaled_weights
+
+    scores = np.empty(len(X))
+    for lo in range(0, len(X), batch_size):
+        logits = X[lo:lo + batch_size] @ scaled_weights + offset
+        scores[lo:lo + batch_size] = _sigmoid(logits)
+    return scores
+
+
+@st.cache_data(show_spinner=False)
+def score_active_users(version):
+    """Fit on all users (churned vs not) and score every active user, cached per data version.
+
+    Always uses full history: risk is "as of now", independent of the sidebar time window.
+    """
+    master_df, sessions_df, recs_df = load_data()
+    users, feature_cols = build_features(master_df, sessions_df)
+
+    X = users[feature_cols].to_numpy(dtype=np.float64)
+    y = users['is_churned'].to_numpy(dtype=np.float64)
+    if len(np.unique(y)) < 2:
+        return pd.DataFrame(columns=['user_id', 'churn_risk']), pd.Series(dtype=float)
+
+    model = fit_logistic(X, y)
+    coefficients = pd.Series(model[0], index=feature_cols).sort_values()
+
+    active = users[~users['is_churned']].copy()
+    active['churn_risk'] = score_batches(X[~users['is_churned'].to_numpy()], model)
+    active = active.sort_values('churn_risk', ascending=False)
+    return active[['user_id', 'country', 'churn_risk', 'recency_days', 'watch_trend',
+                   'total_sessions', 'dominant_device', 'top_genre']].reset_index(drop=True), coefficients
@@ -4,11 +4,13 @@ import altair as alt
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from utils import load_data
+from utils import load_data, data_version
+from churn_risk import score_active_users
+from comparison import comparison_counters, period_values, period_ratio, pct_delta, comparison_frame, render_comparison_chart, period_caption
 
-def render():
+def render(start=None, end=None, compare=None):
     st.header("📉 Churn Insights")
-    master_df, sessions_df, recs_df = load_data()
+    master_df, sessions_df, recs_df = load_data(start, end)
 
     # Overall churn rate and dominant device for churned users
     churned_users = master_df[master_df['churn_date'].notnull()]
@@ -28,16 +30,31 @@ def render():
     churned_users['days_to_churn'] = (churned_users['churn_date'] - churned_users['join_date']).dt.days
     avg_days_to_churn = churned_users['days_to_churn'].mean()
 
+    churn_delta, churn_delta_color, avg_days_delta = f"{churned_count} of {total_users}", "normal", None
+    if compare:
+        # Same KPIs, with the change from the previous period as their delta
+        counters, current, previous = comparison_counters(compare)
+        churns_cur, churns_prev = period_values(counters['churns_by_country'], 'users', current, previous)
+        avg_days_cur, avg_days_prev = period_ratio(counters['churns_by_country'], 'days_to_churn', 'users', current, previous)
+        churn_delta = f"{churns_cur.sum() - churns_prev.sum():+,.0f} churned users vs previous period"
+        churn_delta_color = "inverse"
+        avg_days_delta = pct_delta(avg_days_cur, avg_days_prev)
+
     # Display metrics in 3 columns
     col1, col2, col3 = st.columns(3)
-    col1.metric("Overall Churn Rate", f"{churn_rate:.1f}%", delta=f"{churned_count} of {total_users}")
+    col1.metric("Overall Churn Rate", f"{churn_rate:.1f}%", delta=churn_delta, delta_color=churn_delta_color)
     col2.metric("Dominant Device for Churned Users", dominant_device)
-    col3.metric("Avg Time to Churn", f"{avg_days_to_churn:.0f} days", delta="vs 30-day baseline")
-
+    col3.metric("Avg Time to Churn", f"{avg_days_to_churn:.0f} days", delta=avg_days_delta)
+    if compare:
+        st.caption(period_caption(compare, current, previous))
+        render_comparison_chart(
+            comparison_frame(churns_cur, churns_prev, top_n=10),
+            title=f"Churned Users by Country (Top 10) – {compare}", slice_label="Country", value_label="Churned Users"
+        )
 
     # User Segmentation: Trial Conversion vs Post-Trial Churn
-    # Load data
-    master_df = pd.read_csv('ott_master_dataset.csv')
+    # Work on a naive-datetime copy of the loaded users (keeps headless exports' filtered data)
+    master_df = master_df.copy()
     master_df['join_date'] = pd.to_datetime(master_df['join_date']).dt.tz_localize(None)
     master_df['churn_date'] = pd.to_datetime(master_df['churn_date']).dt.tz_localize(None)
 
@@ -178,3 +195,63 @@ def render():
     st.caption(f"Shows average watch time in the 30 days leading up to churn. {drop_percentage:.1f}% drop from day -30 to day 0. Red line indicates decline point at day -21.")
 
 
+    # Users at Risk: active users scored by a locally fitted churn model
+    st.subheader("Users at Risk")
+    at_risk, coefficients = score_active_users(data_version())
+
+    if at_risk.empty:
+        st.info("Not enough churned and active users to fit a churn-risk model.")
+        return
+
+    high_risk = at_risk[at_risk['churn_risk'] >= 0.5]
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Active Users Scored", f"{len(at_risk):,}")
+    col2.metric("High-Risk Users (≥ 50%)", f"{len(high_risk):,}", delta=f"{100 * len(high_risk) / len(at_risk):.1f}% of active", delta_color="inverse")
+    col3.metric("Avg Churn Risk", f"{100 * at_risk['churn_risk'].mean():.1f}%")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        fig_risk = px.histogram(
+            at_risk,
+            x='churn_risk',
+            nbins=20,
+            color_discrete_sequence=['#FFB7B2'],
+            labels={'churn_risk': 'Predicted Churn Risk'}
+        )
+        fig_risk.update_layout(
+            yaxis_title="Active Users",
+            height=350,
+            margin=dict(t=30, b=30, l=30, r=30)
+        )
+        st.plotly_chart(fig_risk, use_container_width=True)
+        st.caption("Distribution of predicted churn risk across all active users.")
+
+    with col2:
+        drivers = coefficients.reset_index()
+        drivers.columns = ['feature', 'weight']
+        drivers = pd.concat([drivers.head(5), drivers.tail(5)]).drop_duplicates()
+        fig_drivers = px.bar(
+            drivers,
+            x='weight',
+            y='feature',
+            orientation='h',
+            color='weight',
+            color_continuous_scale='RdBu_r',
+            labels={'weight': 'Model Weight (standardised)', 'feature': 'Feature'}
+        )
+        fig_drivers.update_layout(
+            coloraxis_showscale=False,
+            height=350,
+            margin=dict(t=30, b=30, l=30, r=30)
+        )
+        st.plotly_chart(fig_drivers, use_container_width=True)
+        st.caption("Strongest risk drivers: positive weights raise churn risk, negative weights lower it.")
+
+    top_risk = at_risk.head(25).copy()
+    top_risk['churn_risk'] = (100 * top_risk['churn_risk']).round(1)
+    top_risk['watch_trend'] = top_risk['watch_trend'].round(2)
+    top_risk.columns = ['User ID', 'Country', 'Churn Risk (%)', 'Days Since Last Session', 'Watch-Time Trend',
+                        'Sessions', 'Dominant Device', 'Top Genre']
+    st.dataframe(top_risk, use_container_width=True, hide_index=True)
+    st.caption("Top 25 active users by predicted churn risk. Scores use full history and are refreshed when the data changes.")
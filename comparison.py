@@ -0,0 +1,102 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from utils import data_end, data_version
+from trends import compute_daily_counters, period_total
+
+# Sidebar comparison label -> (current period length, lag back to the previous period)
+COMPARISON_PERIODS = {
+    "Week over Week": (pd.DateOffset(weeks=1), pd.DateOffset(weeks=1)),
+    "Month over Month": (pd.DateOffset(months=1), pd.DateOffset(months=1)),
+    "Quarter over Quarter": (pd.DateOffset(months=3), pd.DateOffset(months=3)),
+    "Year over Year": (pd.DateOffset(months=1), pd.DateOffset(years=1)),
+}
+
+
+def period_bounds(label, anchor):
+    """Return ((current_start, current_end), (previous_start, previous_end)) ending on `anchor`"""
+    length, lag = COMPARISON_PERIODS[label]
+    current_end = pd.Timestamp(anchor).normalize()
+    # Periods are inclusive day ranges, so each starts the day after the preceding boundary
+    current_start = current_end - length + pd.Timedelta(days=1)
+    return (current_start, current_end), (current_start - lag, current_end - lag)
+
+
+def comparison_counters(label):
+    """Full-history daily counters plus the current and previous period bounds.
+
+    The periods end on the last day with sessions in the counters themselves, and both are
+    answered from the same cached counters, so comparison reads no raw data of its own.
+    """
+    counters = compute_daily_counters(data_version())
+    session_days = counters['sessions_by_genre']['days']
+    anchor = session_days[-1] if len(session_days) else data_end()
+    current, previous = period_bounds(label, anchor)
+    return counters, current, previous
+
+
+def period_values(counters, metric, current, previous):
+    """Per-slice metric totals for the current and previous period"""
+    return period_total(counters, metric, *current), period_total(counters, metric, *previous)
+
+
+def period_ratio(counters, numerator, denominator, current, previous):
+    """Overall numerator/denominator (e.g. CTR, minutes per session) for both periods"""
+    num_cur, num_prev = period_values(counters, numerator, current, previous)
+    den_cur, den_prev = period_values(counters, denominator, current, previous)
+    return num_cur.sum() / max(den_cur.sum(), 1), num_prev.sum() / max(den_prev.sum(), 1)
+
+
+def slice_ratios(counters, numerator, denominator, current, previous):
+    """Per-slice numerator/denominator for both periods (NaN where a slice has no activity)"""
+    num_cur, num_prev = period_values(counters, numerator, current, previous)
+    den_cur, den_prev = period_values(counters, denominator, current, previous)
+    return num_cur / den_cur.where(den_cur > 0), num_prev / den_prev.where(den_prev > 0)
+
+
+def pct_delta(current_value, previous_value, what=None):
+    """st.metric delta string: percent change vs the previous period (sign first, so st.metric colours it).
+
+    Returns None, i.e. no delta, when the previous period had no activity to compare against.
+    """
+    if not previous_value:
+        return None
+    what = f" {what}" if what else ""
+    return f"{100 * (current_value - previous_value) / previous_value:+.1f}%{what} vs previous period"
+
+
+def comparison_frame(current, previous, top_n=None):
+    """Long-form (slice, period, value) frame for a current-vs-previous grouped bar chart"""
+    frame = pd.DataFrame({'Current': current, 'Previous': previous}).fillna(0)
+    frame = frame.sort_values('Current', ascending=False)
+    if top_n is not None:
+        frame = frame.head(top_n)
+    frame.index.name = 'slice'
+    return frame.reset_index().melt(id_vars='slice', var_name='period', value_name='value')
+
+
+def render_comparison_chart(frame, title, slice_label, value_label, value_format=',.0f'):
+    """Grouped bars of current vs previous period, shared by every section"""
+    fig = px.bar(
+        frame,
+        x='slice',
+        y='value',
+        color='period',
+        barmode='group',
+        text='value',
+        color_discrete_map={'Current': '#A7C7E7', 'Previous': '#E6E6E6'},
+        labels={'slice': slice_label, 'value': value_label, 'period': 'Period'},
+        title=title
+    )
+    fig.update_traces(texttemplate=f'%{{text:{value_format}}}', textposition='outside', cliponaxis=False)
+    fig.update_layout(
+        height=400,
+        margin=dict(l=40, r=40, t=60, b=80)
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def period_caption(label, current, previous):
+    fmt = '%d %b %Y'
+    return (f"{label}: {current[0].strftime(fmt)} – {current[1].strftime(fmt)} "
+            f"vs {previous[0].strftime(fmt)} – {previous[1].strftime(fmt)}.")
@@ -1,13 +1,19 @@
 import streamlit as st
 import pandas as pd
 import altair as alt
-from utils import load_data
+from utils import load_data, data_version
+from trends import ROLLING_WINDOWS, compute_daily_counters, trend_frame
+from comparison import comparison_counters, period_values, slice_ratios, pct_delta, comparison_frame, render_comparison_chart, period_caption
 import plotly.express as px
 import numpy as np
 
-def render():
+def render(start=None, end=None, compare=None):
     st.header("🎬 Consumption Patterns")
-    master_df, sessions_df, recs_df = load_data()
+    master_df, sessions_df, recs_df = load_data(start, end)
+
+    if sessions_df.empty:
+        st.info("No sessions in the selected time window.")
+        return
 
     # Metrics: Most Watched Genre, Most Watched Language, Longest Watch Session
     most_watched_genre = sessions_df.groupby('content_genre')['watch_time_min'].sum().idxmax()
@@ -17,9 +23,21 @@ def render():
     longest_session = sessions_df['watch_time_min'].max()
 
     col1, col2, col3 = st.columns(3)
-    col1.metric("Most Watched Genre", most_watched_genre, f"{most_watched_genre_val:.0f} min")
-    col2.metric("Most Watched Language", most_watched_language, f"{most_watched_language_val:.0f} min")
+    if compare:
+        # Deltas: the same genre/language's watch time in the current vs previous period
+        counters, current, previous = comparison_counters(compare)
+        genre_cur, genre_prev = period_values(counters['sessions_by_genre'], 'watch_time', current, previous)
+        lang_cur, lang_prev = period_values(counters['sessions_by_language'], 'watch_time', current, previous)
+        col1.metric("Most Watched Genre", most_watched_genre,
+                    pct_delta(genre_cur.get(most_watched_genre, 0), genre_prev.get(most_watched_genre, 0), "watch time"))
+        col2.metric("Most Watched Language", most_watched_language,
+                    pct_delta(lang_cur.get(most_watched_language, 0), lang_prev.get(most_watched_language, 0), "watch time"))
+    else:
+        col1.metric("Most Watched Genre", most_watched_genre, f"{most_watched_genre_val:.0f} min")
+        col2.metric("Most Watched Language", most_watched_language, f"{most_watched_language_val:.0f} min")
     col3.metric("Longest Watch Session", f"{longest_session:.0f} min")
+    if compare:
+        st.caption(period_caption(compare, current, previous))
 
     # Content Consumption by Genre and  Pie Chart: Content Consumption by Language
     # Grouped data
@@ -53,6 +71,11 @@ def render():
         )
         st.plotly_chart(fig_genre, use_container_width=True)
         st.caption("Shows which genre was watched the most based on total watch time.")
+        if compare:
+            render_comparison_chart(
+                comparison_frame(genre_cur, genre_prev),
+                title=f"Watch Time by Genre – {compare}", slice_label="Genre", value_label="Watch Time (mins)"
+            )
 
     with col2:
         st.subheader("Content Consumption by Language")
@@ -75,6 +98,11 @@ def render():
         )
         st.plotly_chart(fig_lang, use_container_width=True)
         st.caption("Shows the distribution of content consumption by language.")
+        if compare:
+            render_comparison_chart(
+                comparison_frame(lang_cur, lang_prev),
+                title=f"Watch Time by Language – {compare}", slice_label="Language", value_label="Watch Time (mins)"
+            )
 
     # Combined Line Chart: Average Watch Time by Hour and Weekday
     st.subheader("Average Watch Time by Hour and Weekday")
@@ -128,6 +156,13 @@ def render():
     )
     st.altair_chart(chart6 + text6, use_container_width=True)
     st.caption("Shows average watch time by device type.")
+    if compare:
+        device_cur, device_prev = slice_ratios(counters['sessions_by_device'], 'watch_time', 'sessions', current, previous)
+        render_comparison_chart(
+            comparison_frame(device_cur, device_prev),
+            title=f"Average Watch Time per Session by Device – {compare}", slice_label="Device Type",
+            value_label="Average Watch Time (mins)", value_format='.1f'
+        )
 
     # Stacked Bar Chart: Watch Time by Genre and Device
     st.subheader("Watch Time by Genre and Device")
@@ -168,4 +203,41 @@ def render():
 
     # Render
     st.plotly_chart(fig, use_container_width=True)
-    st.caption("Shows watch time by genre split across different device types.")
\ No newline at end of file
+    st.caption("Shows watch time by genre split across different device types.")
+
+    # Watch-Time Trend: rolling windows answered from pre-bucketed daily counters
+    st.subheader("Watch-Time Trend")
+    col1, col2, col3 = st.columns(3)
+    trend_dimension = col1.selectbox("Split by:", ["Genre", "Language"], key="watch_trend_dimension")
+    trend_granularity = col2.radio("Granularity:", ["Daily", "Weekly"], horizontal=True, key="watch_trend_granularity")
+    trend_window = col3.radio("Rolling window (days):", ROLLING_WINDOWS, horizontal=True, key="watch_trend_window",
+                              disabled=trend_granularity == "Weekly")
+    session_counters = compute_daily_counters(data_version())[
+        'sessions_by_genre' if trend_dimension == "Genre" else 'sessions_by_language']
+    window = 7 if trend_granularity == "Weekly" else trend_window
+    # Average minutes watched per day within each window
+    watch_trend = trend_frame(
+        session_counters, 'watch_time',
+        window=window,
+        step=7 if trend_granularity == "Weekly" else 1,
+        scale=1 / window,
+        start=start, end=end
+    )
+    fig = px.line(
+        watch_trend,
+        x='date',
+        y='value',
+        color='slice',
+        color_discrete_sequence=px.colors.qualitative.Set3,
+        labels={'date': 'Date', 'value': 'Watch Time per Day (mins)', 'slice': trend_dimension}
+    )
+    fig.update_layout(
+        hovermode="x unified",
+        height=450,
+        margin=dict(l=40, r=40, t=40, b=40)
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    if trend_granularity == "Weekly":
+        st.caption(f"Average daily watch time by {trend_dimension.lower()} for each week (7-day buckets ending on the latest date).")
+    else:
+        st.caption(f"Trailing {trend_window}-day average of daily watch time by {trend_dimension.lower()}.")
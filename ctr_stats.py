@@ -0,0 +1,116 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+from utils import load_data
+
+Z_95 = 1.959963984540054
+N_BOOTSTRAP = 2000
+SIGNIFICANCE_LEVEL = 0.05
+
+# dimension label -> merged_data columns defining a slice
+CTR_DIMENSIONS = {
+    "Genre": ["content_genre"],
+    "Device": ["device_type"],
+    "Language": ["language"],
+    "Genre × Language": ["content_genre", "language"],
+}
+
+
+def wilson_interval(clicks, events, z=Z_95):
+    """Wilson score interval for click-through rates, vectorized over slices"""
+    clicks = np.asarray(clicks, dtype=np.float64)
+    events = np.maximum(np.asarray(events, dtype=np.float64), 1)
+    p = clicks / events
+    denom = 1 + z ** 2 / events
+    centre = (p + z ** 2 / (2 * events)) / denom
+    half = z * np.sqrt(p * (1 - p) / events + z ** 2 / (4 * events ** 2)) / denom
+    return centre - half, centre + half
+
+
+def bootstrap_ctr(clicks, events, n_boot=N_BOOTSTRAP, alpha=SIGNIFICANCE_LEVEL, seed=0):
+    """Percentile bootstrap intervals for every slice at once.
+
+    Resampling a slice's n click/no-click events with replacement gives a click count distributed
+    Binomial(n, ctr), so the whole (slices x n_boot) resample matrix is drawn in one call - cost
+    depends on the number of slices, not the number of events.
+    """
+    clicks = np.asarray(clicks, dtype=np.int64)
+    events = np.asarray(events, dtype=np.int64)
+    rng = np.random.default_rng(seed)
+    p = clicks / np.maximum(events, 1)
+    resampled = rng.binomial(events[:, None], p[:, None], size=(len(events), n_boot)) / np.maximum(events, 1)[:, None]
+    low, high = np.quantile(resampled, [alpha / 2, 1 - alpha / 2], axis=1)
+    return low, high
+
+
+def binomial_p_value(clicks, events, baseline):
+    """Exact two-sided binomial test of each slice's clicks against the baseline CTR.
+
+    Sums the probability of every click count no more likely than the observed one under
+    Binomial(events, baseline), so a tiny slice with a CTR of 0 or 1 is only flagged when that
+    outcome is genuinely unlikely. Probabilities are built in log space, one slice at a time.
+    """
+    clicks = np.asarray(clicks, dtype=np.int64)
+    events = np.asarray(events, dtype=np.int64)
+    p0 = min(max(float(baseline), 1e-12), 1 - 1e-12)
+    p_values = np.empty(len(events))
+    for i, (k, n) in enumerate(zip(clicks, events)):
+        outcomes = np.arange(1, n + 1)
+        log_comb = np.concatenate([[0.0], np.cumsum(np.log(n - outcomes + 1) - np.log(outcomes))])
+        log_pmf = log_comb + np.arange(n + 1) * np.log(p0) + (n - np.arange(n + 1)) * np.log1p(-p0)
+        # Small relative tolerance so outcomes tied with the observed one are counted
+        p_values[i] = min(1.0, np.exp(log_pmf[log_pmf <= log_pmf[k] + 1e-7]).sum())
+    return p_values
+
+
+def benjamini_hochberg(p_values):
+    """Benjamini-Hochberg adjusted p-values (q-values), controlling the false discovery rate"""
+    p_values = np.asarray(p_values, dtype=np.float64)
+    n = len(p_values)
+    order = np.argsort(p_values)
+    ranked = p_values[order] * n / np.arange(1, n + 1)
+    # Enforce monotonicity from the largest p-value down
+    adjusted = np.minimum.accumulate(ranked[::-1])[::-1]
+    q_values = np.empty(n)
+    q_values[order] = np.minimum(adjusted, 1.0)
+    return q_values
+
+
+def slice_ctr_stats(merged_data, dimensions=CTR_DIMENSIONS, n_boot=N_BOOTSTRAP):
+    """CTR, Wilson and bootstrap intervals and significance for every slice of every dimension"""
+    baseline = merged_data['clicked'].mean() if len(merged_data) else 0.0
+
+    frames = []
+    for dimension, cols in dimensions.items():
+        counts = merged_data.dropna(subset=cols).groupby(cols)['clicked'].agg(clicks='sum', events='count').reset_index()
+        counts['slice'] = counts[cols[0]].astype(str)
+        for col in cols[1:]:
+            counts['slice'] += ' / ' + counts[col].astype(str)
+        counts['dimension'] = dimension
+        frames.append(counts)
+    stats = pd.concat(frames, ignore_index=True)
+    if stats.empty:
+        return stats.reindex(columns=list(stats.columns) + ['ctr', 'wilson_low', 'wilson_high', 'boot_low', 'boot_high',
+                                                            'p_value', 'q_value', 'significant', 'baseline_ctr'])
+
+    clicks = stats['clicks'].to_numpy(dtype=np.int64)
+    events = stats['events'].to_numpy(dtype=np.int64)
+    stats['ctr'] = clicks / events
+    stats['wilson_low'], stats['wilson_high'] = wilson_interval(clicks, events)
+    stats['boot_low'], stats['boot_high'] = bootstrap_ctr(clicks, events, n_boot=n_boot)
+    # Exact binomial p-values, corrected for testing every slice at once (false discovery rate)
+    stats['p_value'] = binomial_p_value(clicks, events, baseline)
+    stats['q_value'] = benjamini_hochberg(stats['p_value'].to_numpy())
+    stats['significant'] = stats['q_value'] < SIGNIFICANCE_LEVEL
+    stats['baseline_ctr'] = baseline
+    return stats
+
+
+@st.cache_data(show_spinner=False)
+def compute_ctr_stats(version, start=None, end=None):
+    """Slice statistics cached per data version and time window"""
+    master_df, sessions_df, recs_df = load_data(start, end)
+    merged_data = pd.merge(recs_df[['session_id', 'clicked']],
+                           sessions_df[['session_id', 'content_genre', 'device_type', 'language']],
+                           on='session_id', how='left')
+    return slice_ctr_stats(merged_data)
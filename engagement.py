@@ -0,0 +1,193 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import altair as alt
+import plotly.express as px
+from utils import load_data, data_version
+
+RECENCY_BINS = [-1, 7, 30, 90, np.inf]
+RECENCY_LABELS = ["0-7 days", "8-30 days", "31-90 days", "90+ days"]
+FREQUENCY_BINS = [0, 1, 3, 7, np.inf]
+FREQUENCY_LABELS = ["<1 / week", "1-3 / week", "3-7 / week", "7+ / week"]
+GAP_HISTOGRAM_MAX_DAYS = 60
+
+
+def sessionize(sessions_df, as_of=None):
+    """Per-user engagement rhythm from raw sessions, fully vectorized.
+
+    Sorts sessions by (user, time) once, then derives everything with diff/cumsum/reduceat
+    over the sorted arrays - no per-user loops or groupby-apply.
+
+    Returns (gap_hist, median_gap, users):
+      gap_hist   - sessions per whole-day gap since the user's previous session (last bin = 60+ days)
+      median_gap - median gap in days, or None if no user has a second session
+      users      - one row per user: session counts, gap stats, longest/current streak of consecutive
+              active days, recency and the recency/frequency buckets
+    """
+    df = sessions_df[['user_id', 'session_date']].dropna().sort_values(['user_id', 'session_date'], kind='mergesort')
+    if df.empty:
+        return pd.DataFrame(columns=['gap_days', 'sessions']), None, pd.DataFrame(columns=['user_id'])
+
+    user = df['user_id'].to_numpy()
+    # Local wall time as datetime64 keeps day boundaries in Asia/Kolkata
+    ts = df['session_date'].dt.tz_localize(None).to_numpy() if df['session_date'].dt.tz is not None \
+        else df['session_date'].to_numpy()
+    day = ts.astype('datetime64[D]').astype(np.int64)
+    as_of_day = day.max() if as_of is None else np.datetime64(pd.Timestamp(as_of).tz_localize(None), 'D').astype(np.int64)
+
+    # User boundaries in the sorted arrays
+    new_user = np.r_[True, user[1:] != user[:-1]]
+    starts = np.flatnonzero(new_user)
+    ends = np.r_[starts[1:], len(user)] - 1
+    session_count = np.diff(np.r_[starts, len(user)])
+
+    # Inter-session gaps in days; the first session of each user has no gap
+    gap = np.r_[0.0, np.diff(ts).astype('timedelta64[s]').astype(np.float64) / 86400.0]
+    gap[new_user] = 0.0
+    has_gap = session_count > 1
+    mean_gap = np.where(has_gap, np.add.reduceat(gap, starts) / np.maximum(session_count - 1, 1), np.nan)
+    max_gap = np.where(has_gap, np.maximum.reduceat(gap, starts), np.nan)
+
+    # Distinct active days per user, then runs of consecutive days (streaks)
+    new_day = new_user | np.r_[True, day[1:] != day[:-1]]
+    d_user_start = new_user[new_day]
+    d_day = day[new_day]
+    new_streak = d_user_start | np.r_[True, np.diff(d_day) != 1]
+    streak_id = np.cumsum(new_streak) - 1
+    streak_len = np.bincount(streak_id)
+    streak_end_day = d_day[np.r_[np.flatnonzero(new_streak)[1:], len(d_day)] - 1]
+
+    # Streaks are ordered by user, so each user's streaks form a contiguous block
+    user_first_streak = streak_id[np.flatnonzero(d_user_start)]
+    user_last_streak = np.r_[user_first_streak[1:], len(streak_len)] - 1
+    longest_streak = np.maximum.reduceat(streak_len, user_first_streak)
+    # A streak is still running if its last day is today or yesterday relative to as_of
+    current_streak = np.where(as_of_day - streak_end_day[user_last_streak] <= 1, streak_len[user_last_streak], 0)
+    active_days = np.diff(np.r_[np.flatnonzero(d_user_start), len(d_day)])
+
+    first_day, last_day = day[starts], day[ends]
+    tenure_weeks = np.maximum((last_day - first_day) // 7 + 1, 1)
+    sessions_per_week = session_count / tenure_weeks
+
+    users = pd.DataFrame({
+        'user_id': user[starts],
+        'sessions': session_count,
+        'active_days': active_days,
+        'first_session': pd.to_datetime(first_day, unit='D'),
+        'last_session': pd.to_datetime(last_day, unit='D'),
+        'mean_gap_days': mean_gap,
+        'max_gap_days': max_gap,
+        'longest_streak': longest_streak,
+        'current_streak': current_streak,
+        'recency_days': as_of_day - last_day,
+        'sessions_per_week': sessions_per_week,
+    })
+    users['recency_bucket'] = pd.cut(users['recency_days'], RECENCY_BINS, labels=RECENCY_LABELS)
+    users['frequency_bucket'] = pd.cut(users['sessions_per_week'], FREQUENCY_BINS, labels=FREQUENCY_LABELS, right=False)
+
+    # Only a fixed-size histogram and the median leave this function, never per-session rows
+    gaps = gap[~new_user]
+    gap_bins = np.minimum(gaps, GAP_HISTOGRAM_MAX_DAYS).astype(np.int64)
+    gap_counts = np.bincount(gap_bins, minlength=GAP_HISTOGRAM_MAX_DAYS + 1)
+    gap_hist = pd.DataFrame({'gap_days': np.arange(GAP_HISTOGRAM_MAX_DAYS + 1), 'sessions': gap_counts})
+    median_gap = float(np.median(gaps)) if len(gaps) else None
+    return gap_hist, median_gap, users
+
+
+@st.cache_data(show_spinner=False)
+def compute_engagement(version, start=None, end=None):
+    """Sessionize once per data version and time window"""
+    master_df, sessions_df, recs_df = load_data(start, end)
+    gap_hist, median_gap, users = sessionize(sessions_df)
+    if users.empty:
+        return gap_hist, median_gap, users
+
+    # Recency at churn: days between a churned user's last session and their churn date
+    churn = master_df.loc[master_df['churn_date'].notnull(), ['user_id', 'churn_date']]
+    users = users.merge(churn, on='user_id', how='left')
+    churn_day = users['churn_date'].dt.tz_localize(None).dt.normalize()
+    users['days_silent_before_churn'] = (churn_day - users['last_session']).dt.days
+    return gap_hist, median_gap, users
+
+
+def render(start=None, end=None):
+    st.header("🔁 Engagement Rhythm")
+    gap_hist, median_gap, users = compute_engagement(data_version(), start, end)
+
+    if users.empty:
+        st.info("No sessions in the selected time window.")
+        return
+
+    # Metrics: median gap, average longest streak, share of users active in the last week
+    avg_longest_streak = users['longest_streak'].mean()
+    active_last_week = 100 * (users['recency_days'] <= 7).mean()
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Median Days Between Sessions", f"{median_gap:.1f}" if median_gap is not None else "N/A")
+    col2.metric("Avg Longest Streak", f"{avg_longest_streak:.1f} days")
+    col3.metric("Active in Last 7 Days", f"{active_last_week:.1f}%", delta=f"{(users['recency_days'] <= 7).sum()} of {len(users)}")
+
+    # Inter-session gap distribution (binned by whole days, long tail capped)
+    st.subheader("Days Between Sessions")
+    chart_gap = alt.Chart(gap_hist).mark_bar(color='#A7C7E7').encode(
+        x=alt.X('gap_days:O', title=f'Days Since Previous Session ({GAP_HISTOGRAM_MAX_DAYS} = {GAP_HISTOGRAM_MAX_DAYS}+)'),
+        y=alt.Y('sessions:Q', title='Sessions'),
+        tooltip=['gap_days', 'sessions']
+    ).properties(
+        width=600, height=300, title="Inter-Session Gap Distribution"
+    )
+    st.altair_chart(chart_gap, use_container_width=True)
+    st.caption("Shows how many days typically pass between a user's consecutive sessions.")
+
+    # Recency x frequency grid
+    st.subheader("Recency vs Frequency")
+    rf_grid = users.groupby(['recency_bucket', 'frequency_bucket'], observed=False).size().reset_index()
+    rf_grid.columns = ['recency_bucket', 'frequency_bucket', 'user_count']
+    fig = px.density_heatmap(
+        rf_grid,
+        x='recency_bucket',
+        y='frequency_bucket',
+        z='user_count',
+        text_auto=True,
+        color_continuous_scale='Blues',
+        category_orders={'recency_bucket': RECENCY_LABELS, 'frequency_bucket': FREQUENCY_LABELS},
+        labels={'recency_bucket': 'Last Session', 'frequency_bucket': 'Sessions per Week', 'user_count': 'Users'}
+    )
+    fig.update_layout(height=400, margin=dict(l=40, r=40, t=40, b=40))
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption("Users grouped by how recently they last watched and how often they watch.")
+
+    # Longest streak distribution and recency at churn side by side
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("Longest Active Streak")
+        streaks = users['longest_streak'].clip(upper=30).value_counts().sort_index().reset_index()
+        streaks.columns = ['streak_days', 'user_count']
+        fig_streak = px.bar(
+            streaks,
+            x='streak_days',
+            y='user_count',
+            color_discrete_sequence=['#B5EAD7'],
+            labels={'streak_days': 'Consecutive Active Days (30 = 30+)', 'user_count': 'Users'}
+        )
+        fig_streak.update_layout(height=350, margin=dict(t=30, b=30, l=30, r=30))
+        st.plotly_chart(fig_streak, use_container_width=True)
+        st.caption("Longest run of consecutive days with at least one session, per user.")
+
+    with col2:
+        st.subheader("Recency at Churn")
+        silent = users['days_silent_before_churn'].dropna()
+        if silent.empty:
+            st.info("No churned users with sessions in the selected time window.")
+        else:
+            fig_silent = px.histogram(
+                silent.clip(lower=0, upper=90).to_frame(),
+                x='days_silent_before_churn',
+                nbins=30,
+                color_discrete_sequence=['#F7CAC9'],
+                labels={'days_silent_before_churn': 'Days Between Last Session and Churn (90 = 90+)'}
+            )
+            fig_silent.update_layout(showlegend=False, yaxis_title='Churned Users', height=350, margin=dict(t=30, b=30, l=30, r=30))
+            st.plotly_chart(fig_silent, use_container_width=True)
+            st.caption(f"Median churned user went {silent.median():.0f} days without a session before churning.")
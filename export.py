@@ -0,0 +1,275 @@
+"""Headless static HTML export of the dashboard sections.
+
+    python export.py                         # one report for the whole user base
+    python export.py --by country            # one report per country
+    python export.py --by segment --workers 8
+
+Every (variant, section) pair is rendered in a process pool. The data is loaded and split into
+per-variant rows once in the parent and inherited by the workers; each report is a single
+self-contained HTML file.
+"""
+import argparse
+import html
+import logging
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import plotly.offline
+import vl_convert as vlc
+from config import PASTEL_THEME, TIMEZONE
+
+import churn_story
+import churn_risk
+import comparison
+import consumption
+import ctr_stats
+import growth_and_retention
+import heavy_hitters
+import rec_engine
+import trends
+import utils
+
+SECTIONS = {
+    "📈 Growth & Retention": growth_and_retention,
+    "🎬 Consumption Patterns": consumption,
+    "🤖 Recommendation Engine": rec_engine,
+    "📉 Churn Insights": churn_story,
+}
+
+# Every module whose load_data / data_version / st globals are redirected while exporting
+PATCHED_MODULES = [growth_and_retention, consumption, rec_engine, churn_story,
+                   churn_risk, comparison, ctr_stats, heavy_hitters, trends]
+
+SEGMENTS = {
+    "Trial": lambda m: m['is_trial'].astype(bool),
+    "Converted": lambda m: m['converted'].astype(bool),
+    "Churned": lambda m: m['churn_date'].notnull(),
+    "Active": lambda m: m['churn_date'].isnull(),
+}
+
+# Set in the parent before the pool starts; workers inherit them (or receive them once via initargs)
+_DATA = None
+_ROWS = None
+
+logger = logging.getLogger(__name__)
+
+
+class ReportWriter:
+    """Stand-in for the `st` module that records a section's output as HTML.
+
+    Covers the Streamlit calls the sections use; input widgets return their default value.
+    """
+
+    def __init__(self):
+        self.blocks = []
+
+    # Layout: columns render sequentially into the same report
+    def columns(self, spec, **kwargs):
+        return [self] * (spec if isinstance(spec, int) else len(spec))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    # Text
+    def header(self, text, **kwargs):
+        self.blocks.append(f"<h2>{html.escape(str(text))}</h2>")
+
+    def subheader(self, text, **kwargs):
+        self.blocks.append(f"<h3>{html.escape(str(text))}</h3>")
+
+    def markdown(self, text, **kwargs):
+        if text.strip() == "---":
+            self.blocks.append("<hr>")
+        else:
+            self.blocks.append(f"<p>{html.escape(str(text))}</p>")
+
+    def caption(self, text, **kwargs):
+        self.blocks.append(f'<p class="caption">{html.escape(str(text))}</p>')
+
+    def info(self, text, **kwargs):
+        self.blocks.append(f'<p class="info">{html.escape(str(text))}</p>')
+
+    warning = info
+
+    def metric(self, label, value, delta=None, delta_color="normal", **kwargs):
+        delta_html = f'<div class="delta">{html.escape(str(delta))}</div>' if delta is not None else ""
+        self.blocks.append(
+            f'<div class="metric"><div class="label">{html.escape(str(label))}</div>'
+            f'<div class="value">{html.escape(str(value))}</div>{delta_html}</div>'
+        )
+
+    # Data and charts
+    def dataframe(self, df, **kwargs):
+        self.blocks.append(df.to_html(index=not kwargs.get("hide_index", False), classes="table", border=0))
+
+    def plotly_chart(self, fig, **kwargs):
+        self.blocks.append(f'<div class="chart">{fig.to_html(full_html=False, include_plotlyjs=False)}</div>')
+
+    def altair_chart(self, chart, **kwargs):
+        # Rendered to static SVG so the report needs no vega scripts
+        self.blocks.append(f'<div class="chart">{vlc.vegalite_to_svg(chart.to_json())}</div>')
+
+    # Widgets: exports always use the default choice
+    def selectbox(self, label, options, index=0, **kwargs):
+        return list(options)[index]
+
+    radio = selectbox
+
+    def checkbox(self, label, value=False, **kwargs):
+        return value
+
+    def html(self):
+        return "\n".join(self.blocks)
+
+
+def _slug(text):
+    return re.sub(r"[^a-z0-9]+", "-", str(text).lower()).strip("-") or "all"
+
+
+def variants(master_df, by=None):
+    """(name, user mask) pairs for the requested breakdown; None = whole user base"""
+    if by is None:
+        return [("All Users", None)]
+    if by == "country":
+        return [(country, master_df['country'] == country) for country in sorted(master_df['country'].dropna().unique())]
+    if by == "segment":
+        return [(name, rule(master_df)) for name, rule in SEGMENTS.items()]
+    raise ValueError(f"Unknown breakdown '{by}'")
+
+
+def variant_rows(data, by=None):
+    """Positional rows of (master, sessions, recs) for every variant; None = all rows.
+
+    Computed once in the parent, so the section tasks of a variant only take rows instead of
+    each re-scanning the sessions and events tables.
+    """
+    master_df, sessions_df, recs_df = data
+    rows = {}
+    for name, mask in variants(master_df, by):
+        if mask is None:
+            rows[name] = None
+            continue
+        in_sessions = sessions_df['user_id'].isin(master_df.loc[mask, 'user_id']).to_numpy()
+        in_recs = recs_df['session_id'].isin(sessions_df.loc[in_sessions, 'session_id']).to_numpy()
+        rows[name] = (np.flatnonzero(mask.to_numpy()), np.flatnonzero(in_sessions), np.flatnonzero(in_recs))
+    return rows
+
+
+def _variant_data(variant):
+    rows = _ROWS[variant[0]]
+    if rows is None:
+        return tuple(df.copy() for df in _DATA)
+    return tuple(df.iloc[idx].copy() for df, idx in zip(_DATA, rows))
+
+
+def _init_worker(data, rows):
+    global _DATA, _ROWS
+    _DATA, _ROWS = data, rows
+
+
+def render_section(task):
+    """Render one section for one variant in a worker and return its HTML body.
+
+    A failing section is logged and replaced by an error block, so it does not abort the other reports.
+    """
+    variant, section = task
+    data = _variant_data(variant)
+    # Cached helpers key on the data version, so give every variant its own key
+    version = f"{utils.data_version()}:{variant[1]}:{_slug(variant[0])}"
+    writer = ReportWriter()
+
+    for module in PATCHED_MODULES:
+        if hasattr(module, "load_data"):
+            module.load_data = lambda start=None, end=None: tuple(df.copy() for df in data)
+        if hasattr(module, "data_version"):
+            module.data_version = lambda: version
+        if hasattr(module, "st"):
+            module.st = writer
+
+    try:
+        SECTIONS[section].render()
+    except Exception as exc:
+        logger.exception("Failed to render %s for %s", section, variant[0])
+        return (f"<h2>{html.escape(section)}</h2>"
+                f'<p class="error">This section could not be rendered: {html.escape(repr(exc))}</p>')
+    return writer.html()
+
+
+def build_report(title, section_bodies):
+    """Assemble one self-contained HTML page (plotly.js inlined once, Altair charts as SVG)"""
+    theme = PASTEL_THEME
+    sections = "\n".join(f'<section>{body}</section>' for body in section_bodies)
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{html.escape(title)}</title>
+<script type="text/javascript">{plotly.offline.get_plotlyjs()}</script>
+<style>
+body {{ background: {theme['backgroundColor']}; font-family: {theme['font']}; color: #333333; margin: 2rem; }}
+section {{ background: white; border-radius: 8px; padding: 1rem 2rem; margin-bottom: 2rem; }}
+.metric {{ display: inline-block; min-width: 220px; margin: 0.5rem 1.5rem 0.5rem 0; vertical-align: top; }}
+.metric .label {{ font-size: 0.85rem; color: #666666; }}
+.metric .value {{ font-size: 1.8rem; }}
+.metric .delta {{ font-size: 0.85rem; color: #2e7d32; }}
+.caption {{ font-size: 0.85rem; color: #888888; }}
+.info {{ background: #E8F0FB; padding: 0.5rem 1rem; border-radius: 4px; }}
+.error {{ background: #FDECEA; padding: 0.5rem 1rem; border-radius: 4px; }}
+.table {{ border-collapse: collapse; font-size: 0.85rem; }}
+.table th, .table td {{ padding: 0.25rem 0.75rem; border-bottom: 1px solid {theme['gridColor']}; }}
+</style>
+</head>
+<body>
+<h1>{html.escape(title)}</h1>
+<p class="caption">Generated {pd.Timestamp.now(tz=TIMEZONE).strftime('%Y-%m-%d %H:%M')} ({TIMEZONE})</p>
+{sections}
+</body>
+</html>
+"""
+
+
+def export_reports(out_dir="reports", by=None, workers=None):
+    """Render every section for every variant in parallel and write one HTML file per variant"""
+    global _DATA, _ROWS
+    _DATA = utils.load_data()
+    _ROWS = variant_rows(_DATA, by)
+    variant_list = [((name, by), section) for name in _ROWS for section in SECTIONS]
+
+    # fork shares the loaded frames with workers without pickling them; spawn gets them once per worker
+    context = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker, initargs=(_DATA, _ROWS)) as pool:
+        bodies = list(pool.map(render_section, variant_list))
+
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    n_sections = len(SECTIONS)
+    for i in range(0, len(variant_list), n_sections):
+        (name, _), _ = variant_list[i]
+        title = "OTT KPIs – Business View" + ("" if by is None else f" – {name}")
+        path = os.path.join(out_dir, f"{_slug(name)}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(build_report(title, bodies[i:i + n_sections]))
+        paths.append(path)
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export all dashboard sections to static HTML reports.")
+    parser.add_argument("--out", default="reports", help="output directory (default: reports)")
+    parser.add_argument("--by", choices=["country", "segment"], default=None, help="write one report per country or segment")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(processName)s: %(message)s")
+
+    started = time.time()
+    written = export_reports(args.out, args.by, args.workers)
+    print(f"Wrote {len(written)} report(s) to {args.out}/ in {time.time() - started:.1f}s")
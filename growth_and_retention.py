@@ -2,12 +2,13 @@ import streamlit as st
 import pandas as pd
 import altair as alt
 from utils import load_data
+from comparison import comparison_counters, period_values, pct_delta, comparison_frame, render_comparison_chart, period_caption
 import plotly.express as px
 import plotly.graph_objects as go
 
-def render():
+def render(start=None, end=None, compare=None):
     st.header("📈 Growth & Retention")
-    master_df, sessions_df, recs_df = load_data()
+    master_df, sessions_df, recs_df = load_data(start, end)
 
 
     # Overall growth % metric and avg weekly sessions
@@ -41,19 +42,34 @@ def render():
     retention_rate = 100 * retained_count / total_users if total_users > 0 else 0
 
 
+    # In comparison mode the KPI deltas contrast the current and previous period
+    if compare:
+        counters, current, previous = comparison_counters(compare)
+        signups_cur, signups_prev = period_values(counters['signups_by_country'], 'users', current, previous)
+        churns_cur, churns_prev = period_values(counters['churns_by_country'], 'users', current, previous)
+
     col1, col2, col3 = st.columns(3)
 
-    # 1. Overall Growth Rate
-    col1.metric("Overall Growth in New Users", f"{growth_pct:.1f}%", delta=f"{monthly_users['new_users'].iloc[-1] - monthly_users['new_users'].iloc[0]}")
+    # 1. Overall Growth Rate (signups in the current vs previous period when comparing)
+    if compare:
+        col1.metric("New Users This Period", f"{signups_cur.sum():,.0f}", delta=pct_delta(signups_cur.sum(), signups_prev.sum()))
+    else:
+        col1.metric("Overall Growth in New Users", f"{growth_pct:.1f}%", delta=f"{monthly_users['new_users'].iloc[-1] - monthly_users['new_users'].iloc[0]}")
 
-    # 2. Avg Weekly Visits for Long-Term Users
+    # 2. Avg Weekly Visits for Long-Term Users (the daily counters cover all users, so no period delta)
     if avg_weekly_sessions is not None:
         col2.metric("Avg Weekly Platform Visits – Loyal Users (12+ Months)", f"{avg_weekly_sessions:.2f}")
     else:
         col2.metric("Avg Weekly Platform Visits – Loyal Users (12+ Months)", "N/A")
 
-    # 3. Overall Retention Rate
-    col3.metric("Overall Retention Rate", f"{retention_rate:.1f}%", delta=f"{retained_count} of {total_users}")
+    # 3. Overall Retention Rate (churned users this period vs last when comparing)
+    if compare:
+        col3.metric("Overall Retention Rate", f"{retention_rate:.1f}%",
+                    delta=f"{churns_cur.sum() - churns_prev.sum():+,.0f} churned users vs previous period", delta_color="inverse")
+    else:
+        col3.metric("Overall Retention Rate", f"{retention_rate:.1f}%", delta=f"{retained_count} of {total_users}")
+    if compare:
+        st.caption(period_caption(compare, current, previous))
 
 
 
@@ -225,6 +241,12 @@ def render():
 
     st.plotly_chart(fig, use_container_width=True)
 
+    if compare:
+        render_comparison_chart(
+            comparison_frame(signups_cur, signups_prev, top_n=10),
+            title=f"New Users by Country (Top 10) – {compare}", slice_label="Country", value_label="New Users"
+        )
+
 
     # Gender distribution for active users
     st.subheader("Gender Distribution (Active Users)")
@@ -0,0 +1,109 @@
+import streamlit as st
+import pandas as pd
+
+# Counters kept per requested top-K slot; more slots tighten the error bound
+CAPACITY_PER_K = 50
+EVENT_CHUNK_SIZE = 200_000
+
+
+class SpaceSaving:
+    """Bounded-memory heavy-hitters summary over streamed chunks (mergeable Misra-Gries / Space-Saving).
+
+    Each chunk is pre-aggregated and merged into at most `capacity` counters. When the merge overflows,
+    the (capacity + 1)-th largest count is subtracted from every counter and non-positive ones are
+    dropped. Every estimate undercounts its true frequency by at most `error` <= total / (capacity + 1),
+    and any key more frequent than that bound is guaranteed to be tracked.
+    """
+
+    def __init__(self, capacity, key_cols):
+        self.capacity = capacity
+        self.key_cols = list(key_cols)
+        self.table = None
+        self.total = 0
+        self.error = 0
+
+    def update(self, chunk, value_col=None):
+        """Merge one chunk of events; `value_col` is summed for tracked keys (e.g. clicks)"""
+        if chunk.empty:
+            return
+        grouped = chunk.groupby(self.key_cols)
+        counts = grouped.size().to_frame('count')
+        counts['events'] = counts['count']
+        counts['value'] = grouped[value_col].sum().astype(float) if value_col else 0.0
+        self.total += int(counts['count'].sum())
+
+        table = counts if self.table is None else self.table.add(counts, fill_value=0)
+        if len(table) > self.capacity:
+            cut = table['count'].nlargest(self.capacity + 1).iloc[-1]
+            table['count'] -= cut
+            table = table[table['count'] > 0]
+            self.error += cut
+        self.table = table
+
+    def top(self, k):
+        """Top-k keys with frequency bounds.
+
+        `events`, `value` and `rate` only cover events seen since a key was last (re)inserted, so
+        they can undercount a key that was evicted earlier; exact_totals gives the exact figures.
+        """
+        columns = self.key_cols + ['count_low', 'count_high', 'events', 'value', 'rate']
+        if self.table is None:
+            return pd.DataFrame(columns=columns)
+        top = self.table.nlargest(k, 'count').copy()
+        top['count_low'] = top['count']
+        top['count_high'] = top['count'] + self.error
+        top['rate'] = top['value'] / top['events']
+        return top.drop(columns='count').reset_index()[columns]
+
+
+def top_k(chunks, key_cols, k=10, value_col=None, capacity=None):
+    """Stream chunks through a SpaceSaving summary and return (top-k frame, sketch)"""
+    sketch = SpaceSaving(capacity or CAPACITY_PER_K * k, key_cols)
+    for chunk in chunks:
+        sketch.update(chunk, value_col)
+    return sketch.top(k), sketch
+
+
+def exact_totals(chunks, keys, value_col):
+    """Exact event count and `value_col` sum for the given keys (a key frame), in one pass over the chunks"""
+    key_cols = list(keys.columns)
+    index = pd.MultiIndex.from_frame(keys) if len(key_cols) > 1 else pd.Index(keys[key_cols[0]])
+    totals = pd.DataFrame({'events': 0.0, 'value': 0.0}, index=index)
+    for chunk in chunks:
+        chunk_keys = pd.MultiIndex.from_frame(chunk[key_cols]) if len(key_cols) > 1 else pd.Index(chunk[key_cols[0]])
+        matched = chunk[chunk_keys.isin(index)]
+        if len(matched):
+            totals = totals.add(matched.groupby(key_cols)[value_col].agg(events='count', value='sum'), fill_value=0)
+    return totals.reindex(index)
+
+
+def rec_event_chunks(recs_df, sessions_df, key_cols, chunksize=EVENT_CHUNK_SIZE):
+    """Slice already-loaded recommendation events into chunks joined to session attributes.
+
+    Each chunk only looks up the sessions its own events belong to, so no session-wide lookup
+    table is built; events whose session is unknown or missing a key are skipped.
+    """
+    key_cols = list(key_cols)
+    for i in range(0, len(recs_df), chunksize):
+        chunk = recs_df.iloc[i:i + chunksize][['session_id', 'clicked']]
+        attributes = sessions_df.loc[sessions_df['session_id'].isin(chunk['session_id']), ['session_id'] + key_cols]
+        chunk = chunk.merge(attributes.drop_duplicates('session_id'), on='session_id', how='inner')
+        yield chunk.dropna(subset=key_cols)
+
+
+@st.cache_data(show_spinner=False)
+def compute_top_rec_slices(version, key_cols, k=10, start=None, end=None, _chunks=None):
+    """Top-k recommendation slices by volume, cached per data version and window.
+
+    `_chunks` is a callable returning a fresh stream of events carrying `key_cols` and `clicked`
+    (e.g. rec_event_chunks over the caller's loaded frames). It is left out of the cache key and
+    only called on a miss: once to pick the top-k keys with the sketch, and once more to count
+    their events and clicks exactly.
+    """
+    key_cols = list(key_cols)
+    top, sketch = top_k(_chunks(), key_cols, k=k, value_col='clicked')
+    if not top.empty:
+        exact = exact_totals(_chunks(), top[key_cols], 'clicked')
+        top['events'], top['value'] = exact['events'].to_numpy(), exact['value'].to_numpy()
+        top['rate'] = top['value'] / top['events']
+    return top, sketch.total, sketch.error
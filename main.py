@@ -3,6 +3,9 @@ from growth_and_retention import render as render_growth
 from consumption import render as render_consumption
 from rec_engine import render as render_rec
 from churn_story import render as render_churn
+from engagement import render as render_engagement
+from utils import TIME_WINDOWS, window_bounds
+from comparison import COMPARISON_PERIODS
 
 # Page configuration
 st.set_page_config(
@@ -27,20 +30,32 @@ section = st.sidebar.radio(
         "📈 Growth & Retention",
         "🎬 Consumption Patterns", 
         "🤖 Recommendation Engine",
-        "📉 Churn Insights"
+        "📉 Churn Insights",
+        "🔁 Engagement Rhythm"
     ],
     index=0
 )
 
+# Time window: bounded windows only read the session/event partitions they overlap
+time_window = st.sidebar.selectbox("Time Window:", list(TIME_WINDOWS), index=0)
+start, end = window_bounds(time_window)
+
+# Comparison mode: current vs previous period, served from cached daily counters
+compare = None
+if st.sidebar.checkbox("Compare periods", value=False):
+    compare = st.sidebar.selectbox("Comparison:", list(COMPARISON_PERIODS), index=1)
+
 # Render the selected section
 if section == "📈 Growth & Retention":
-    render_growth()
+    render_growth(start, end, compare)
 elif section == "🎬 Consumption Patterns":
-    render_consumption()
+    render_consumption(start, end, compare)
 elif section == "🤖 Recommendation Engine":
-    render_rec()
+    render_rec(start, end, compare)
 elif section == "📉 Churn Insights":
-    render_churn()
+    render_churn(start, end, compare)
+elif section == "🔁 Engagement Rhythm":
+    render_engagement(start, end)
 
 # Footer
 st.sidebar.markdown("---")
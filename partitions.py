@@ -0,0 +1,210 @@
+import json
+import os
+import pandas as pd
+from config import TIMEZONE
+
+# Partitioned layout: data/<table>/month=YYYY-MM.csv plus data/<table>/_manifest.json
+DATA_DIR = "data"
+MANIFEST_NAME = "_manifest.json"
+
+# table name -> (flat source CSV, partition date column)
+TABLES = {
+    "sessions": ("ott_sessions_dataset.csv", "session_date"),
+    "recs": ("ott_recommendation_events.csv", "event_date"),
+}
+
+
+def _to_local(ts):
+    """Return a tz-aware Asia/Kolkata timestamp (naive values are treated as local wall time)"""
+    ts = pd.Timestamp(ts)
+    return ts.tz_convert(TIMEZONE) if ts.tzinfo is not None else ts.tz_localize(TIMEZONE)
+
+
+def _wall_time(dt_series):
+    """Strip timezone so partitions keep the same naive local format as the flat CSVs"""
+    if pd.api.types.is_datetime64_any_dtype(dt_series) and dt_series.dt.tz is not None:
+        return dt_series.dt.tz_convert(TIMEZONE).dt.tz_localize(None)
+    return dt_series
+
+
+def table_dir(table):
+    return os.path.join(DATA_DIR, table)
+
+
+def partition_path(table, month):
+    return os.path.join(table_dir(table), f"month={month}.csv")
+
+
+def load_manifest(table):
+    """Return the partition manifest for a table, or None if it has not been partitioned"""
+    path = os.path.join(table_dir(table), MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_manifest(table, manifest):
+    path = os.path.join(table_dir(table), MANIFEST_NAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def write_partition(table, month, df, manifest=None):
+    """Write one month of a table and record its min/max stats in the manifest"""
+    _, date_col = TABLES[table]
+    os.makedirs(table_dir(table), exist_ok=True)
+    df = df.sort_values(date_col).copy()
+    df[date_col] = _wall_time(df[date_col])
+    df.to_csv(partition_path(table, month), index=False)
+
+    manifest = manifest if manifest is not None else (load_manifest(table) or {"date_column": date_col, "partitions": {}})
+    manifest["partitions"][month] = {
+        "file": os.path.basename(partition_path(table, month)),
+        "rows": int(len(df)),
+        "min": df[date_col].min().isoformat() if len(df) else None,
+        "max": df[date_col].max().isoformat() if len(df) else None,
+    }
+    return manifest
+
+
+def build_partitions(table, chunksize=500_000):
+    """Split a flat source CSV into monthly partitions keyed on its date column.
+
+    Each chunk is appended straight to its month files, so peak memory is one chunk.
+    Rows within a month keep source order; compact_partition re-sorts a month.
+    """
+    source, date_col = TABLES[table]
+    manifest = {"date_column": date_col, "partitions": {}}
+    os.makedirs(table_dir(table), exist_ok=True)
+    for name in os.listdir(table_dir(table)):
+        if name.startswith("month=") and name.endswith(".csv"):
+            os.remove(os.path.join(table_dir(table), name))
+
+    for chunk in pd.read_csv(source, parse_dates=[date_col], chunksize=chunksize):
+        chunk[date_col] = _wall_time(chunk[date_col])
+        for month, part in chunk.groupby(chunk[date_col].dt.strftime("%Y-%m")):
+            is_new = month not in manifest["partitions"]
+            part.to_csv(partition_path(table, month), mode="a", header=is_new, index=False)
+
+            stats = manifest["partitions"].setdefault(month, {
+                "file": os.path.basename(partition_path(table, month)), "rows": 0, "min": None, "max": None,
+            })
+            part_min, part_max = part[date_col].min().isoformat(), part[date_col].max().isoformat()
+            stats["rows"] += int(len(part))
+            # ISO timestamps in the same naive format compare correctly as strings
+            stats["min"] = part_min if stats["min"] is None else min(stats["min"], part_min)
+            stats["max"] = part_max if stats["max"] is None else max(stats["max"], part_max)
+
+    save_manifest(table, manifest)
+    return manifest
+
+
+def compact_partition(table, month):
+    """Rewrite a single month in place: drop duplicate rows and re-sort by date"""
+    _, date_col = TABLES[table]
+    manifest = load_manifest(table)
+    if manifest is None or month not in manifest["partitions"]:
+        raise KeyError(f"No partition {month} for table '{table}'")
+
+    df = pd.read_csv(partition_path(table, month), parse_dates=[date_col]).drop_duplicates()
+    write_partition(table, month, df, manifest)
+    save_manifest(table, manifest)
+    return manifest["partitions"][month]
+
+
+def prune_partitions(manifest, start=None, end=None):
+    """Return the months whose [min, max] range overlaps [start, end]"""
+    start = _to_local(start) if start is not None else None
+    end = _to_local(end) if end is not None else None
+
+    months = []
+    for month, stats in sorted(manifest["partitions"].items()):
+        if not stats["rows"]:
+            continue
+        if start is not None and _to_local(stats["max"]) < start:
+            continue
+        if end is not None and _to_local(stats["min"]) > end:
+            continue
+        months.append(month)
+    return months
+
+
+def latest_timestamp(table):
+    """Latest date of a table: from the manifest, or one date-column scan of the flat source CSV"""
+    source, date_col = TABLES[table]
+    manifest = load_manifest(table)
+    if manifest is None:
+        if not os.path.exists(source):
+            return None
+        latest = pd.read_csv(source, usecols=[date_col], parse_dates=[date_col])[date_col].max()
+        return None if pd.isna(latest) else _to_local(latest)
+    maxes = [stats["max"] for stats in manifest["partitions"].values() if stats["max"]]
+    return _to_local(max(maxes)) if maxes else None
+
+
+def read_partition(table, month, usecols=None):
+    """Read one month partition; `usecols` limits the columns parsed (the date column is always read)"""
+    _, date_col = TABLES[table]
+    if usecols is not None:
+        usecols = list(dict.fromkeys([*usecols, date_col]))
+    return pd.read_csv(partition_path(table, month), usecols=usecols, parse_dates=[date_col])
+
+
+def read_table(table, start=None, end=None):
+    """Read a table bounded to [start, end], touching only overlapping partitions.
+
+    Falls back to the flat source CSV when the table has not been partitioned yet.
+    Returned dates are naive local wall time, like the flat CSVs.
+    """
+    source, date_col = TABLES[table]
+    manifest = load_manifest(table)
+
+    if manifest is None:
+        df = pd.read_csv(source, parse_dates=[date_col])
+    else:
+        months = prune_partitions(manifest, start, end)
+        frames = [pd.read_csv(partition_path(table, m), parse_dates=[date_col]) for m in months]
+        if frames:
+            df = pd.concat(frames, ignore_index=True)
+        else:
+            # Keep the schema of the table even when nothing overlaps the window
+            df = pd.read_csv(partition_path(table, next(iter(manifest["partitions"]))), parse_dates=[date_col], nrows=0) \
+                if manifest["partitions"] else pd.read_csv(source, parse_dates=[date_col], nrows=0)
+
+    # Partitions are month-granular, so trim the edge months to the exact window
+    if start is not None:
+        df = df[df[date_col] >= _to_local(start).tz_localize(None)]
+    if end is not None:
+        df = df[df[date_col] <= _to_local(end).tz_localize(None)]
+    return df.reset_index(drop=True)
+
+
+def iter_table(table, start=None, end=None, chunksize=200_000, usecols=None):
+    """Stream a table bounded to [start, end] as chunks of at most `chunksize` rows.
+
+    Reads pruned partitions (or the flat source CSV) incrementally, so peak memory is one chunk.
+    `usecols` limits the columns parsed; the date column is always read for the window filter.
+    """
+    source, date_col = TABLES[table]
+    manifest = load_manifest(table)
+    paths = [source] if manifest is None else [partition_path(table, m) for m in prune_partitions(manifest, start, end)]
+    if usecols is not None:
+        usecols = list(dict.fromkeys([*usecols, date_col]))
+
+    for path in paths:
+        for chunk in pd.read_csv(path, usecols=usecols, parse_dates=[date_col], chunksize=chunksize):
+            if start is not None:
+                chunk = chunk[chunk[date_col] >= _to_local(start).tz_localize(None)]
+            if end is not None:
+                chunk = chunk[chunk[date_col] <= _to_local(end).tz_localize(None)]
+            if len(chunk):
+                yield chunk
+
+
+if __name__ == "__main__":
+    for name in TABLES:
+        built = build_partitions(name)
+        print(f"{name}: {len(built['partitions'])} partitions written to {table_dir(name)}")
@@ -2,61 +2,152 @@ import streamlit as st
 import pandas as pd
 import altair as alt
 import plotly.express as px
-from utils import load_data
+from utils import load_data, data_version
+from ctr_stats import compute_ctr_stats, wilson_interval
+from heavy_hitters import compute_top_rec_slices, rec_event_chunks
+from trends import ROLLING_WINDOWS, compute_daily_counters, trend_frame
+from comparison import (comparison_counters, period_values, period_ratio, slice_ratios, pct_delta, comparison_frame,
+                        render_comparison_chart, period_caption)
 from config import PASTEL_THEME
 import plotly.graph_objects as go
 
 
-def render():
+def render(start=None, end=None, compare=None):
     st.header("🤖 Recommendation Engine")
     
     # Load data
-    master_df, sessions_df, recs_df = load_data()
-    
-    # Always merge recs with sessions to get device_type and genre
-    merged_data = pd.merge(recs_df, sessions_df[['session_id', 'content_genre', 'device_type', 'language']], 
-                          on='session_id', how='left')
+    master_df, sessions_df, recs_df = load_data(start, end)
+
+    if recs_df.empty:
+        st.info("No recommendation events in the selected time window.")
+        return
     
+    # Current and previous periods, read from the cached full-history counters
+    if compare:
+        counters, current, previous = comparison_counters(compare)
+
+    # Confidence intervals and significance for every CTR slice (cached per data version)
+    ctr_stats = compute_ctr_stats(data_version(), start, end)
+    ctr_stats = ctr_stats.assign(
+        ctr=ctr_stats['ctr'] * 100,
+        ci_low=ctr_stats['wilson_low'] * 100,
+        ci_high=ctr_stats['wilson_high'] * 100
+    )
+
     # CTR by Content Genre Bar Chart
     st.subheader("CTR by Content Genre")
-    ctr_by_genre = merged_data.groupby('content_genre').agg({
-        'clicked': 'mean'
-    }).reset_index().dropna(subset=['content_genre'])
-    ctr_by_genre['ctr'] = ctr_by_genre['clicked'] * 100
-    ctr_by_genre = ctr_by_genre.sort_values('ctr', ascending=False)
+    ctr_by_genre = ctr_stats[ctr_stats['dimension'] == 'Genre'].sort_values('ctr', ascending=False)
+    genre_order = ctr_by_genre['content_genre'].tolist()
     chart8 = alt.Chart(ctr_by_genre).mark_bar(color='#E2F0CB').encode(
-        x=alt.X('content_genre:N', title='Content Genre', sort='-y'),
+        x=alt.X('content_genre:N', title='Content Genre', sort=genre_order),
         y=alt.Y('ctr:Q', title='Click-Through Rate (%)'),
-        tooltip=['content_genre', 'ctr']
+        tooltip=['content_genre', alt.Tooltip('ctr:Q', format='.2f'), 'events',
+                 alt.Tooltip('ci_low:Q', format='.2f'), alt.Tooltip('ci_high:Q', format='.2f'),
+                 alt.Tooltip('q_value:Q', format='.3f')]
     ).properties(
         width=600, height=400, title="CTR by Content Genre"
     )
+    error8 = alt.Chart(ctr_by_genre).mark_errorbar(color='#555555').encode(
+        x=alt.X('content_genre:N', sort=genre_order), y=alt.Y('ci_low:Q', title='Click-Through Rate (%)'), y2='ci_high:Q'
+    )
     text8 = chart8.mark_text(align='center', baseline='bottom', dy=-5, color='black').encode(
-        x='content_genre:N', y='ctr:Q', text=alt.Text('ctr:Q', format='.1f'), color=alt.value('black')
+        x=alt.X('content_genre:N', sort=genre_order), y='ci_high:Q', text=alt.Text('ctr:Q', format='.1f'), color=alt.value('black')
     )
-    st.altair_chart(chart8 + text8, use_container_width=True)
-    st.caption("Shows click-through rate by content genre, sorted by highest CTR.")
+    st.altair_chart(chart8 + error8 + text8, use_container_width=True)
+    st.caption("Shows click-through rate by content genre, sorted by highest CTR. Whiskers are 95% Wilson intervals.")
+    if compare:
+        genre_ctr_cur, genre_ctr_prev = slice_ratios(counters['recs_by_genre'], 'clicks', 'events', current, previous)
+        render_comparison_chart(
+            comparison_frame(100 * genre_ctr_cur, 100 * genre_ctr_prev),
+            title=f"CTR by Content Genre – {compare}", slice_label="Content Genre",
+            value_label="Click-Through Rate (%)", value_format='.1f'
+        )
+        st.caption(period_caption(compare, current, previous))
     
     # CTR by Device Type Bar Chart
     st.subheader("CTR by Device Type")
-    ctr_by_device = merged_data.groupby('device_type').agg({
-        'clicked': 'mean'
-    }).reset_index().dropna(subset=['device_type'])
-    ctr_by_device['ctr'] = ctr_by_device['clicked'] * 100
-    ctr_by_device = ctr_by_device.sort_values('ctr', ascending=False)
+    ctr_by_device = ctr_stats[ctr_stats['dimension'] == 'Device'].sort_values('ctr', ascending=False)
+    device_order = ctr_by_device['device_type'].tolist()
     chart9 = alt.Chart(ctr_by_device).mark_bar(color='#CBAACB').encode(
-        x=alt.X('device_type:N', title='Device Type', sort='-y'),
+        x=alt.X('device_type:N', title='Device Type', sort=device_order),
         y=alt.Y('ctr:Q', title='Click-Through Rate (%)'),
-        tooltip=['device_type', 'ctr']
+        tooltip=['device_type', alt.Tooltip('ctr:Q', format='.2f'), 'events',
+                 alt.Tooltip('ci_low:Q', format='.2f'), alt.Tooltip('ci_high:Q', format='.2f'),
+                 alt.Tooltip('q_value:Q', format='.3f')]
     ).properties(
         width=600, height=300, title="CTR by Device Type"
     )
+    error9 = alt.Chart(ctr_by_device).mark_errorbar(color='#555555').encode(
+        x=alt.X('device_type:N', sort=device_order), y=alt.Y('ci_low:Q', title='Click-Through Rate (%)'), y2='ci_high:Q'
+    )
     text9 = chart9.mark_text(align='center', baseline='bottom', dy=-5, color='black').encode(
-        x='device_type:N', y='ctr:Q', text=alt.Text('ctr:Q', format='.1f'), color=alt.value('black')
+        x=alt.X('device_type:N', sort=device_order), y='ci_high:Q', text=alt.Text('ctr:Q', format='.1f'), color=alt.value('black')
     )
-    st.altair_chart(chart9 + text9, use_container_width=True)
-    st.caption("Shows click-through rate by device type, sorted by highest CTR.")
+    st.altair_chart(chart9 + error9 + text9, use_container_width=True)
+    st.caption("Shows click-through rate by device type, sorted by highest CTR. Whiskers are 95% Wilson intervals.")
+    if compare:
+        device_ctr_cur, device_ctr_prev = slice_ratios(counters['recs_by_device'], 'clicks', 'events', current, previous)
+        render_comparison_chart(
+            comparison_frame(100 * device_ctr_cur, 100 * device_ctr_prev),
+            title=f"CTR by Device Type – {compare}", slice_label="Device Type",
+            value_label="Click-Through Rate (%)", value_format='.1f'
+        )
+
+    # Significance table across all slices
+    st.subheader("CTR Confidence by Slice")
+    dimension = st.selectbox("Slice by:", ctr_stats['dimension'].unique().tolist(), key="ctr_stats_dimension")
+    slice_table = ctr_stats[ctr_stats['dimension'] == dimension].sort_values('ctr', ascending=False)
+    slice_table = pd.DataFrame({
+        'Slice': slice_table['slice'],
+        'Events': slice_table['events'],
+        'CTR (%)': slice_table['ctr'].round(2),
+        'Wilson 95% CI (%)': (slice_table['ci_low'].round(2).astype(str) + ' – ' + slice_table['ci_high'].round(2).astype(str)),
+        'Bootstrap 95% CI (%)': ((slice_table['boot_low'] * 100).round(2).astype(str) + ' – ' + (slice_table['boot_high'] * 100).round(2).astype(str)),
+        'Binomial p-value': slice_table['p_value'].round(4),
+        'q-value (BH)': slice_table['q_value'].round(4),
+        'Significant': slice_table['significant'].map({True: '✅', False: '—'}),
+    })
+    st.dataframe(slice_table, use_container_width=True, hide_index=True)
+    overall_ctr = 100 * ctr_stats['baseline_ctr'].iloc[0] if not ctr_stats.empty else 0
+    st.caption(f"Each slice is tested against the overall CTR of {overall_ctr:.2f}% with a two-sided exact binomial test. "
+               "p-values are Benjamini–Hochberg adjusted across all slices (false discovery rate 5%); "
+               "slices without a ✅ are not distinguishable from the overall rate.")
     
+    # CTR Trend: rolling windows answered from pre-bucketed daily counters
+    st.subheader("CTR Trend")
+    col1, col2, col3 = st.columns(3)
+    trend_dimension = col1.selectbox("Split by:", ["Genre", "Device"], key="ctr_trend_dimension")
+    trend_granularity = col2.radio("Granularity:", ["Daily", "Weekly"], horizontal=True, key="ctr_trend_granularity")
+    trend_window = col3.radio("Rolling window (days):", ROLLING_WINDOWS, horizontal=True, key="ctr_trend_window",
+                              disabled=trend_granularity == "Weekly")
+    rec_counters = compute_daily_counters(data_version())[
+        'recs_by_genre' if trend_dimension == "Genre" else 'recs_by_device']
+    ctr_trend = trend_frame(
+        rec_counters, 'clicks', 'events',
+        window=7 if trend_granularity == "Weekly" else trend_window,
+        step=7 if trend_granularity == "Weekly" else 1,
+        scale=100,
+        start=start, end=end
+    )
+    fig = px.line(
+        ctr_trend.dropna(subset=['value']),
+        x='date',
+        y='value',
+        color='slice',
+        color_discrete_sequence=px.colors.qualitative.Pastel,
+        labels={'date': 'Date', 'value': 'Click-Through Rate (%)', 'slice': trend_dimension}
+    )
+    fig.update_layout(
+        hovermode="x unified",
+        height=450,
+        margin=dict(l=40, r=40, t=40, b=40)
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    if trend_granularity == "Weekly":
+        st.caption(f"Weekly CTR by {trend_dimension.lower()} (non-overlapping 7-day buckets ending on the latest date).")
+    else:
+        st.caption(f"Trailing {trend_window}-day CTR by {trend_dimension.lower()}, one point per day.")
+
     # Recommendation Funnel
     st.subheader("Recommendation Funnel")
 
@@ -92,41 +183,59 @@ def render():
 
     st.plotly_chart(fig, use_container_width=True)
     st.caption("Tracks user journey from seeing recommendations to clicking and likely watching content. Watch numbers are estimated.")
+    if compare:
+        # Funnel stages for the current period, with change vs the previous one
+        shown_cur, shown_prev = period_values(counters['recs_by_genre'], 'events', current, previous)
+        clicked_cur, clicked_prev = period_values(counters['recs_by_genre'], 'clicks', current, previous)
+        ctr_cur, ctr_prev = period_ratio(counters['recs_by_genre'], 'clicks', 'events', current, previous)
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Recommendations Shown", f"{shown_cur.sum():,.0f}", delta=pct_delta(shown_cur.sum(), shown_prev.sum()))
+        col2.metric("Recommendations Clicked", f"{clicked_cur.sum():,.0f}", delta=pct_delta(clicked_cur.sum(), clicked_prev.sum()))
+        col3.metric("Overall CTR", f"{100 * ctr_cur:.2f}%", delta=f"{100 * (ctr_cur - ctr_prev):+.2f} pp vs previous period")
 
     
     # CTR by Genre and Language (Top 10 Pairs)
     st.subheader("CTR by Genre and Language (Top 10 Pairs)")
-    ctr_by_genre_lang = merged_data.groupby(['content_genre', 'language']).agg({
-        'clicked': 'mean',
-        'event_id': 'count'
-    }).reset_index().dropna(subset=['content_genre', 'language'])
-
-    ctr_by_genre_lang['ctr'] = ctr_by_genre_lang['clicked'] * 100
-    top_pairs = ctr_by_genre_lang.nlargest(10, 'event_id')
-
-    # Plotly bar chart with grouped bars
-    fig = px.bar(
-        top_pairs,
-        x='content_genre',
-        y='ctr',
-        color='language',
-        text=top_pairs['ctr'].round(1).astype(str) + '%',
-        barmode='group',
-        color_discrete_sequence=px.colors.qualitative.Pastel
+    # Top pairs by volume from a bounded-memory heavy-hitters sketch over chunks of the loaded events
+    pair_cols = ('content_genre', 'language')
+    top_pairs, pair_events, pair_error = compute_top_rec_slices(
+        data_version(), pair_cols, 10, start, end,
+        _chunks=lambda: rec_event_chunks(recs_df, sessions_df, pair_cols)
     )
+    if top_pairs.empty:
+        st.info("No genre and language pairs with recommendation events in the selected time window.")
+    else:
+        top_pairs['ctr'] = top_pairs['rate'] * 100
+        ci_low, ci_high = wilson_interval(top_pairs['value'], top_pairs['events'])
+        top_pairs['ci_low'], top_pairs['ci_high'] = ci_low * 100, ci_high * 100
 
-    fig.update_traces(
-        textposition='outside',
-        marker_line_width=1
-    )
+        # Plotly bar chart with grouped bars
+        fig = px.bar(
+            top_pairs,
+            x='content_genre',
+            y='ctr',
+            color='language',
+            text=top_pairs['ctr'].round(1).astype(str) + '%',
+            barmode='group',
+            error_y=top_pairs['ci_high'] - top_pairs['ctr'],
+            error_y_minus=top_pairs['ctr'] - top_pairs['ci_low'],
+            color_discrete_sequence=px.colors.qualitative.Pastel
+        )
 
-    fig.update_layout(
-        xaxis_title="Genre",
-        yaxis_title="Click-Through Rate (%)",
-        height=450,
-        width=700,
-        margin=dict(l=20, r=20, t=60, b=80)
-    )
+        fig.update_traces(
+            textposition='outside',
+            marker_line_width=1
+        )
 
-    st.plotly_chart(fig, use_container_width=True)
-    st.caption("Shows click-through rate by genre and language for the top 10 pairs by recommendation volume.") 
\ No newline at end of file
+        fig.update_layout(
+            xaxis_title="Genre",
+            yaxis_title="Click-Through Rate (%)",
+            height=450,
+            width=700,
+            margin=dict(l=20, r=20, t=60, b=80)
+        )
+
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption("Shows click-through rate by genre and language for the top 10 pairs by recommendation volume, with 95% Wilson intervals. "
+                   f"Pairs are picked from heavy-hitter volume estimates over {pair_events:,} events, each within {pair_error:,.0f} "
+                   "events of the exact count; CTR and intervals use exact counts for the pairs shown.") 
\ No newline at end of file
@@ -0,0 +1,31 @@
+import pandas as pd
+from churn_risk import build_features
+
+
+def test_churn_day_sessions_count():
+    tz = "Asia/Kolkata"
+    master_df = pd.DataFrame({
+        "user_id": [1, 2],
+        "country": ["India", "US"],
+        "join_date": pd.to_datetime(["2024-01-01", "2024-01-01"]).tz_localize(tz),
+        "churn_date": pd.to_datetime(["2024-03-01", None]).tz_localize(tz),
+        "is_trial": [False, False],
+        "converted": [True, True],
+    })
+    # User 1 watched on the evening of their churn day and once after it
+    sessions_df = pd.DataFrame({
+        "user_id": [1, 1, 1, 2],
+        "session_date": pd.to_datetime(["2024-02-20 10:00", "2024-03-01 20:00", "2024-03-02 09:00",
+                                        "2024-03-10 08:00"]).tz_localize(tz),
+        "watch_time_min": [30.0, 45.0, 60.0, 20.0],
+        "device_type": ["TV", "TV", "TV", "Mobile"],
+        "content_genre": ["Drama", "Drama", "Drama", "Comedy"],
+    })
+
+    users, feature_cols = build_features(master_df, sessions_df)
+    churned = users.set_index("user_id").loc[1]
+
+    assert churned["recency_days"] == 0
+    assert churned["total_sessions"] == 2
+    assert churned["recent_watch"] == 75
+    assert users.set_index("user_id").loc[2, "recency_days"] == 0
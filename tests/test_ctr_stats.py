@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+from ctr_stats import wilson_interval, binomial_p_value, benjamini_hochberg, slice_ctr_stats
+
+
+def test_wilson_interval():
+    low, high = wilson_interval([0, 50, 10], [10, 100, 10])
+
+    # Textbook Wilson 95% bounds for 50/100
+    assert low[1] == pytest.approx(0.4038, abs=1e-4)
+    assert high[1] == pytest.approx(0.5962, abs=1e-4)
+    # All-0 and all-1 slices still get a non-degenerate interval inside [0, 1]
+    assert low[0] == pytest.approx(0.0, abs=1e-12) and 0 < high[0] < 1
+    assert 0 < low[2] < 1 and high[2] == pytest.approx(1.0)
+
+
+def test_binomial_p_value():
+    p = binomial_p_value([0, 5, 10, 50], [5, 5, 100, 100], 0.1)
+
+    # 0 of 5 is the most likely outcome at a 10% baseline
+    assert p[0] == pytest.approx(1.0)
+    # 5 of 5 at 10% has probability 1e-5, and nothing is less likely
+    assert p[1] == pytest.approx(1e-5)
+    assert p[2] == pytest.approx(1.0)
+    assert p[3] < 1e-20
+
+
+def test_benjamini_hochberg():
+    q = benjamini_hochberg([0.01, 0.04, 0.03, 0.5])
+
+    # 0.03 * 4 / 2 = 0.06 is pulled down to the next rank's 0.04 * 4 / 3
+    assert q == pytest.approx([0.04, 0.04 * 4 / 3, 0.04 * 4 / 3, 0.5])
+    # Adjusted values never fall below the raw p-values
+    assert (q >= np.array([0.01, 0.04, 0.03, 0.5])).all()
+
+
+def test_tiny_extreme_slices_not_significant():
+    # 2000 events at 50% CTR, plus tiny slices that clicked never (A) or always (B)
+    genres = ["Drama"] * 2000 + ["A"] * 5 + ["B"] * 2
+    clicked = np.r_[np.arange(2000) % 2 == 0, np.zeros(5, bool), np.ones(2, bool)].astype(int)
+    merged = pd.DataFrame({"clicked": clicked, "content_genre": genres,
+                           "device_type": "TV", "language": "English"})
+
+    stats = slice_ctr_stats(merged, n_boot=200).set_index(["dimension", "slice"])
+
+    assert stats.loc[("Genre", "A"), "boot_low"] == stats.loc[("Genre", "A"), "boot_high"] == 0
+    assert not stats.loc[("Genre", "A"), "significant"]
+    assert not stats.loc[("Genre", "B"), "significant"]
+    # A degenerate bootstrap would give p = 2 / (n_boot + 1); the exact test gives 2 * 0.5 ** 5
+    assert stats.loc[("Genre", "A"), "p_value"] == pytest.approx(0.0625, rel=0.02)
+
+
+def test_empty_slices_keep_schema():
+    merged = pd.DataFrame({"clicked": [], "content_genre": [], "device_type": [], "language": []})
+
+    stats = slice_ctr_stats(merged)
+
+    assert stats.empty
+    assert {"ctr", "p_value", "q_value", "significant"} <= set(stats.columns)
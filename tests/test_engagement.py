@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+from engagement import sessionize
+
+
+@pytest.fixture
+def sessions_df():
+    # User 1: active Jan 1-3 (twice on Jan 2), then Jan 10. User 2: a single session on Jan 5.
+    # Rows are deliberately unsorted to exercise the (user, time) sort.
+    rows = [
+        (1, "2024-01-10 10:00"),
+        (2, "2024-01-05 09:00"),
+        (1, "2024-01-02 22:00"),
+        (1, "2024-01-01 10:00"),
+        (1, "2024-01-03 10:00"),
+        (1, "2024-01-02 10:00"),
+    ]
+    df = pd.DataFrame(rows, columns=["user_id", "session_date"])
+    df["session_date"] = pd.to_datetime(df["session_date"]).dt.tz_localize("Asia/Kolkata")
+    return df
+
+
+def test_user_stats(sessions_df):
+    gap_hist, median_gap, users = sessionize(sessions_df)
+    users = users.set_index("user_id")
+
+    u1 = users.loc[1]
+    assert u1["sessions"] == 5
+    assert u1["active_days"] == 4
+    assert u1["mean_gap_days"] == pytest.approx(2.25)
+    assert u1["max_gap_days"] == pytest.approx(7.0)
+    assert u1["longest_streak"] == 3
+    assert u1["current_streak"] == 1
+    assert u1["recency_days"] == 0
+    assert u1["frequency_bucket"] == "1-3 / week"
+
+    u2 = users.loc[2]
+    assert u2["sessions"] == 1
+    assert np.isnan(u2["mean_gap_days"])
+    assert u2["longest_streak"] == 1
+    assert u2["current_streak"] == 0
+    assert u2["recency_days"] == 5
+    assert u2["recency_bucket"] == "0-7 days"
+
+
+def test_gap_summary(sessions_df):
+    gap_hist, median_gap, users = sessionize(sessions_df)
+
+    assert median_gap == pytest.approx(0.75)
+    counts = gap_hist.set_index("gap_days")["sessions"]
+    assert counts[0] == 2 and counts[1] == 1 and counts[7] == 1
+    assert counts.sum() == 4
+
+
+def test_empty_sessions():
+    empty = pd.DataFrame({"user_id": [], "session_date": pd.to_datetime([]).tz_localize("Asia/Kolkata")})
+    gap_hist, median_gap, users = sessionize(empty)
+
+    assert gap_hist.empty and users.empty
+    assert median_gap is None
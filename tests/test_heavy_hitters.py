@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+from heavy_hitters import SpaceSaving, top_k, exact_totals, rec_event_chunks
+
+
+@pytest.fixture
+def events():
+    # Zipf-like stream: a few heavy genres and a long tail of rare ones, in shuffled order
+    rng = np.random.default_rng(7)
+    genres = rng.zipf(1.5, size=20_000) % 500
+    return pd.DataFrame({"content_genre": genres.astype(str), "clicked": rng.integers(0, 2, size=len(genres))})
+
+
+def chunks_of(df, size=1_000):
+    return [df.iloc[i:i + size] for i in range(0, len(df), size)]
+
+
+def test_error_bound_and_guaranteed_tracking(events):
+    capacity = 20
+    top, sketch = top_k(chunks_of(events), ["content_genre"], k=5, value_col="clicked", capacity=capacity)
+    true_counts = events["content_genre"].value_counts()
+
+    assert sketch.total == len(events)
+    assert sketch.error <= sketch.total / (capacity + 1)
+    assert len(sketch.table) <= capacity
+
+    # Estimates never overcount and undercount by at most the error bound
+    tracked = sketch.table["count"]
+    truth = true_counts.reindex(tracked.index.get_level_values(0)).to_numpy()
+    assert (tracked.to_numpy() <= truth).all()
+    assert (truth - tracked.to_numpy() <= sketch.error).all()
+
+    # Every key more frequent than the bound is tracked, and the true top 5 bracket their bounds
+    frequent = true_counts[true_counts > sketch.error].index
+    assert set(frequent) <= set(tracked.index.get_level_values(0))
+    assert set(top["content_genre"]) == set(true_counts.index[:5])
+    bounded = top.set_index("content_genre")
+    assert (bounded["count_low"] <= true_counts[bounded.index]).all()
+    assert (true_counts[bounded.index] <= bounded["count_high"]).all()
+
+
+def test_exact_totals(events):
+    keys = pd.DataFrame({"content_genre": ["1", "2", "missing"]})
+
+    totals = exact_totals(chunks_of(events), keys, "clicked")
+
+    for genre in ["1", "2"]:
+        rows = events[events["content_genre"] == genre]
+        assert totals.loc[genre, "events"] == len(rows)
+        assert totals.loc[genre, "value"] == rows["clicked"].sum()
+    assert totals.loc["missing", "events"] == 0
+
+
+def test_empty_stream_keeps_key_columns():
+    top = SpaceSaving(10, ["content_genre", "language"]).top(5)
+
+    assert top.empty
+    assert list(top.columns[:2]) == ["content_genre", "language"]
+
+
+def test_rec_event_chunks_joins_per_chunk():
+    sessions = pd.DataFrame({"session_id": [1, 2, 3], "content_genre": ["Drama", None, "Comedy"]})
+    recs = pd.DataFrame({"session_id": [1, 1, 2, 3, 4], "clicked": [1, 0, 1, 1, 1]})
+
+    chunks = list(rec_event_chunks(recs, sessions, ["content_genre"], chunksize=2))
+
+    joined = pd.concat(chunks, ignore_index=True)
+    # Session 2 has no genre and session 4 is unknown, so their events are skipped
+    assert joined["session_id"].tolist() == [1, 1, 3]
+    assert joined["content_genre"].tolist() == ["Drama", "Drama", "Comedy"]
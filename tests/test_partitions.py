@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+from partitions import build_partitions, load_manifest, prune_partitions, read_table, iter_table, latest_timestamp
+
+
+@pytest.fixture
+def sessions_store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    sessions = pd.DataFrame({
+        "session_id": range(6),
+        "session_date": ["2024-01-05 10:00", "2024-01-31 23:30", "2024-02-01 00:15",
+                         "2024-02-20 12:00", "2024-03-02 08:00", "2024-03-31 22:00"],
+        "watch_time_min": [10.0, 20.0, 30.0, 40.0, 50.0, 60.0],
+    })
+    sessions.to_csv("ott_sessions_dataset.csv", index=False)
+    # Small chunks so months are appended across several chunks
+    return build_partitions("sessions", chunksize=2)
+
+
+def test_manifest_stats(sessions_store):
+    assert sorted(sessions_store["partitions"]) == ["2024-01", "2024-02", "2024-03"]
+    feb = sessions_store["partitions"]["2024-02"]
+    assert feb["rows"] == 2
+    assert feb["min"] == "2024-02-01T00:15:00" and feb["max"] == "2024-02-20T12:00:00"
+    assert load_manifest("sessions") == sessions_store
+
+
+def test_prune_partitions(sessions_store):
+    assert prune_partitions(sessions_store) == ["2024-01", "2024-02", "2024-03"]
+    # Jan's last row is 23:30 on Jan 31, so a window starting Feb 1 skips January
+    assert prune_partitions(sessions_store, "2024-02-01", "2024-02-29") == ["2024-02"]
+    # Pruning uses each month's min/max, not calendar bounds: Feb 21 - Mar 1 touches no rows
+    assert prune_partitions(sessions_store, "2024-02-21", "2024-03-01 23:59") == []
+    assert prune_partitions(sessions_store, "2024-01-31 23:00", "2024-02-01 01:00") == ["2024-01", "2024-02"]
+
+
+def test_read_table_trims_edge_months(sessions_store):
+    df = read_table("sessions", "2024-01-31 12:00", "2024-03-02 08:00")
+
+    assert df["session_id"].tolist() == [1, 2, 3, 4]
+    # Timezone-aware bounds are compared as Asia/Kolkata wall time
+    aware = read_table("sessions", pd.Timestamp("2024-01-31 18:00", tz="UTC"))
+    assert aware["session_id"].tolist() == [1, 2, 3, 4, 5]
+
+
+def test_read_table_empty_window_keeps_schema(sessions_store):
+    df = read_table("sessions", "2025-01-01", "2025-02-01")
+
+    assert df.empty
+    assert list(df.columns) == ["session_id", "session_date", "watch_time_min"]
+
+
+def test_iter_table_matches_read_table(sessions_store):
+    chunks = list(iter_table("sessions", "2024-01-10", "2024-03-10", chunksize=1, usecols=["watch_time_min"]))
+
+    assert all(len(chunk) == 1 for chunk in chunks)
+    assert list(chunks[0].columns) == ["session_date", "watch_time_min"]
+    assert pd.concat(chunks)["watch_time_min"].tolist() == [20.0, 30.0, 40.0, 50.0]
+
+
+def test_latest_timestamp(sessions_store):
+    assert latest_timestamp("sessions") == pd.Timestamp("2024-03-31 22:00", tz="Asia/Kolkata")
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+from partitions import build_partitions
+from trends import build_daily_counters, compute_daily_counters, window_series, trend_frame, period_total
+
+
+@pytest.fixture
+def counters():
+    # Drama: 1 event/day for 10 days from Jan 1; Comedy: 2 events on Jan 5 only
+    days = pd.date_range("2024-01-01", periods=10, freq="D")
+    df = pd.DataFrame({
+        "event_date": list(days) + [pd.Timestamp("2024-01-05")] * 2,
+        "content_genre": ["Drama"] * 10 + ["Comedy"] * 2,
+        "clicked": [1, 0] * 5 + [1, 1],
+    })
+    return build_daily_counters(df, "event_date", "content_genre", {"events": None, "clicks": "clicked"})
+
+
+def test_window_series_complete_windows_only(counters):
+    values, dates = window_series(counters, "events", window=7)
+
+    # 10 days of history hold 4 complete 7-day windows, ending Jan 7 .. Jan 10
+    assert list(dates) == list(pd.date_range("2024-01-07", "2024-01-10", freq="D"))
+    drama = list(counters["slices"]).index("Drama")
+    assert values[drama].tolist() == [7, 7, 7, 7]
+    comedy = list(counters["slices"]).index("Comedy")
+    assert values[comedy].tolist() == [2, 2, 2, 2]
+
+
+def test_window_series_step_counts_back_from_last_day(counters):
+    values, dates = window_series(counters, "events", window=3, step=4)
+
+    assert list(dates) == [pd.Timestamp("2024-01-06"), pd.Timestamp("2024-01-10")]
+
+
+def test_window_longer_than_history(counters):
+    values, dates = window_series(counters, "events", window=28)
+
+    assert len(dates) == 0 and values.shape == (2, 0)
+
+
+def test_trend_frame_ratio(counters):
+    frame = trend_frame(counters, "clicks", "events", window=3, scale=100).set_index(["date", "slice"])["value"]
+
+    # Windows without events have no ratio rather than a zero
+    assert np.isnan(frame[(pd.Timestamp("2024-01-03"), "Comedy")])
+    assert frame[(pd.Timestamp("2024-01-05"), "Comedy")] == pytest.approx(100)
+    assert frame[(pd.Timestamp("2024-01-05"), "Drama")] == pytest.approx(200 / 3)
+
+
+def test_counters_from_partitions_match_flat_source(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # A session on Jan 31 whose events spill into February
+    sessions = pd.DataFrame({
+        "session_id": [1, 2, 3],
+        "user_id": [10, 11, 10],
+        "session_date": ["2024-01-15 10:00", "2024-01-31 23:30", "2024-02-03 09:00"],
+        "content_genre": ["Drama", "Comedy", "Drama"],
+        "language": ["English", "Hindi", "English"],
+        "device_type": ["TV", "Mobile", "TV"],
+        "watch_time_min": [30.0, 45.0, 60.0],
+    })
+    recs = pd.DataFrame({
+        "session_id": [1, 2, 2, 3],
+        "event_date": ["2024-01-15 10:05", "2024-01-31 23:40", "2024-02-01 00:10", "2024-02-03 09:05"],
+        "clicked": [1, 0, 1, 1],
+    })
+    master = pd.DataFrame({
+        "user_id": [10, 11], "country": ["India", "US"],
+        "join_date": ["2023-12-01", "2024-01-10"], "churn_date": [None, "2024-02-10"],
+    })
+    sessions.to_csv("ott_sessions_dataset.csv", index=False)
+    recs.to_csv("ott_recommendation_events.csv", index=False)
+    master.to_csv("ott_master_dataset.csv", index=False)
+
+    flat = compute_daily_counters("flat-source")
+    build_partitions("sessions")
+    build_partitions("recs")
+    partitioned = compute_daily_counters("partitioned")
+
+    for name in flat:
+        assert list(partitioned[name]["slices"]) == list(flat[name]["slices"])
+        assert list(partitioned[name]["days"]) == list(flat[name]["days"])
+        for metric, prefix in flat[name]["prefix"].items():
+            np.testing.assert_allclose(partitioned[name]["prefix"][metric], prefix)
+
+    # The February event of the January session still counts towards Comedy
+    clicks = period_total(partitioned["recs_by_genre"], "clicks", "2024-02-01", "2024-02-29")
+    assert clicks["Comedy"] == 1 and clicks["Drama"] == 1
+    assert period_total(partitioned["churns_by_country"], "days_to_churn")["US"] == 31
@@ -0,0 +1,225 @@
+import os
+import streamlit as st
+import pandas as pd
+import numpy as np
+from partitions import load_manifest, prune_partitions, partition_path, read_partition, iter_table
+
+ROLLING_WINDOWS = [7, 28]
+
+# counter set name -> (table, date column, slice column, {metric: value column, None = row count})
+COUNTER_SPECS = {
+    "recs_by_genre": ("recs", "event_date", "content_genre", {"events": None, "clicks": "clicked"}),
+    "recs_by_device": ("recs", "event_date", "device_type", {"events": None, "clicks": "clicked"}),
+    "sessions_by_genre": ("sessions", "session_date", "content_genre", {"sessions": None, "watch_time": "watch_time_min"}),
+    "sessions_by_language": ("sessions", "session_date", "language", {"sessions": None, "watch_time": "watch_time_min"}),
+    "sessions_by_device": ("sessions", "session_date", "device_type", {"sessions": None, "watch_time": "watch_time_min"}),
+    "signups_by_country": ("master", "join_date", "country", {"users": None}),
+    "churns_by_country": ("master", "churn_date", "country", {"users": None, "days_to_churn": "days_to_churn"}),
+}
+
+
+def daily_counts(df, date_col, slice_col, metrics):
+    """Per (slice, local day) metric totals of a frame; the mergeable unit counters are built from"""
+    df = df.dropna(subset=[date_col, slice_col])
+    local_day = df[date_col].dt.tz_localize(None) if df[date_col].dt.tz is not None else df[date_col]
+    grouped = df.groupby([df[slice_col].rename('slice'), local_day.dt.normalize().rename('day')])
+    counts = pd.DataFrame({
+        metric: (grouped.size() if column is None else grouped[column].sum()).astype(np.float64)
+        for metric, column in metrics.items()
+    })
+    counts.index = counts.index.set_names(['slice', 'day'])
+    return counts
+
+
+def counters_from_counts(counts, metrics):
+    """Densify (slice, day) totals into a (slice x day) counter per metric, plus prefix sums.
+
+    Totals for the same (slice, day) are added, so counts from different partitions combine freely.
+    Any window or period total is then prefix[:, end] - prefix[:, start], so trend and
+    comparison queries cost O(days) per slice instead of a rescan of the events.
+    """
+    counts = counts.groupby(level=['slice', 'day']).sum()
+    if counts.empty:
+        days, slices = pd.DatetimeIndex([]), pd.Index([])
+    else:
+        day_level = counts.index.get_level_values('day')
+        days = pd.date_range(day_level.min(), day_level.max(), freq='D')
+        slices = pd.Index(sorted(counts.index.get_level_values('slice').unique()))
+
+    n_slices, n_days = len(slices), len(days)
+    if n_days:
+        day_idx = (counts.index.get_level_values('day') - days[0]).days.to_numpy()
+        flat_idx = slices.get_indexer(counts.index.get_level_values('slice')) * n_days + day_idx
+    else:
+        flat_idx = np.zeros(0, dtype=np.int64)
+    counters = {}
+    for metric in metrics:
+        weights = counts[metric].to_numpy(dtype=np.float64) if metric in counts else None
+        dense = np.bincount(flat_idx, weights=weights, minlength=n_slices * n_days).reshape(n_slices, n_days)
+        counters[metric] = np.concatenate([np.zeros((n_slices, 1)), np.cumsum(dense, axis=1)], axis=1)
+
+    return {'days': days, 'slices': slices, 'prefix': counters}
+
+
+def build_daily_counters(df, date_col, slice_col, metrics):
+    """Bucket events into a dense (slice x day) counter per metric, plus prefix sums"""
+    return counters_from_counts(daily_counts(df, date_col, slice_col, metrics), metrics)
+
+
+def day_position(counters, ts, side='left'):
+    """Prefix-array position of a timestamp: 'left' counts from that day, 'right' through it"""
+    day = pd.Timestamp(ts)
+    day = (day.tz_localize(None) if day.tzinfo is not None else day).normalize()
+    return int(np.clip(counters['days'].searchsorted(day, side=side), 0, len(counters['days'])))
+
+
+def period_total(counters, metric, start=None, end=None):
+    """Per-slice total of a metric over [start, end], from two prefix lookups"""
+    prefix = counters['prefix'][metric]
+    lo = 0 if start is None else day_position(counters, start, 'left')
+    hi = prefix.shape[1] - 1 if end is None else day_position(counters, end, 'right')
+    return pd.Series(prefix[:, hi] - prefix[:, min(lo, hi)], index=counters['slices'])
+
+
+def window_series(counters, metric, window, step=1):
+    """Trailing `window`-day totals ending on every `step`-th day (counted back from the last day).
+
+    Only complete windows are returned: the first `window - 1` days of history have no point,
+    so averages never show a ramp-up from partially filled windows.
+    """
+    prefix = counters['prefix'][metric]
+    n_days = prefix.shape[1] - 1
+    ends = np.arange(n_days, window - 1, -step)[::-1]
+    starts = ends - window
+    return prefix[:, ends] - prefix[:, starts], counters['days'][ends - 1]
+
+
+def trend_frame(counters, numerator, denominator=None, window=7, step=1, scale=1.0, start=None, end=None):
+    """Long-form (date, slice, value) rolling trend; value is numerator/denominator when given.
+
+    `start`/`end` limit which window end dates are shown; the windows themselves may reach back
+    before `start`, since the counters hold the full history.
+    """
+    num, dates = window_series(counters, numerator, window, step)
+    if denominator is None:
+        values = num * scale
+    else:
+        den, _ = window_series(counters, denominator, window, step)
+        values = np.divide(num, den, out=np.full_like(num, np.nan), where=den > 0) * scale
+
+    frame = pd.DataFrame(values.T, index=dates, columns=counters['slices'])
+    frame.index.name = 'date'
+    if start is not None:
+        frame = frame[frame.index >= pd.Timestamp(start).tz_localize(None).normalize()]
+    if end is not None:
+        frame = frame[frame.index <= pd.Timestamp(end).tz_localize(None)]
+    return frame.reset_index().melt(id_vars='date', var_name='slice', value_name='value')
+
+
+def _table_columns(table):
+    """Slice and value columns the counter specs need from `table`"""
+    columns = []
+    for spec_table, _, slice_col, metrics in COUNTER_SPECS.values():
+        if spec_table == table:
+            columns += [slice_col] + [column for column in metrics.values() if column is not None]
+    return list(dict.fromkeys(columns))
+
+
+# Session attributes joined onto recommendation events before counting
+REC_SESSION_COLUMNS = list(dict.fromkeys(slice_col for table, _, slice_col, _ in COUNTER_SPECS.values() if table == "recs"))
+
+
+def _table_counts(table, df):
+    """Daily counts of every spec on `table`"""
+    return {
+        name: daily_counts(df, date_col, slice_col, metrics)
+        for name, (spec_table, date_col, slice_col, metrics) in COUNTER_SPECS.items() if spec_table == table
+    }
+
+
+def _with_session_attributes(recs, sessions):
+    lookup = sessions.drop_duplicates('session_id').set_index('session_id')[REC_SESSION_COLUMNS]
+    return recs.join(lookup, on='session_id')
+
+
+def _partition_fingerprint(table, month):
+    path = partition_path(table, month)
+    if not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+@st.cache_data(show_spinner=False)
+def _partition_counts(table, month, fingerprint):
+    """Daily counts for one month partition, cached on the fingerprint of the files it reads.
+
+    Recommendation events take their genre and device from sessions of the same or the
+    previous month, since a session can start before the month boundary it emits events across.
+    """
+    if table == "sessions":
+        return _table_counts(table, read_partition("sessions", month, usecols=_table_columns("sessions")))
+
+    recs = read_partition("recs", month, usecols=['session_id', 'clicked'])
+    session_months = [m for m in (str(pd.Period(month, freq='M') - 1), month)
+                      if _partition_fingerprint("sessions", m) is not None]
+    sessions = pd.concat(
+        [read_partition("sessions", m, usecols=['session_id'] + REC_SESSION_COLUMNS) for m in session_months]
+        or [pd.DataFrame(columns=['session_id'] + REC_SESSION_COLUMNS)],
+        ignore_index=True
+    )
+    return _table_counts(table, _with_session_attributes(recs, sessions))
+
+
+def _iter_counts(table):
+    """Daily counts of `table`, one month partition (or one chunk of the flat source CSV) at a time"""
+    manifest = load_manifest(table)
+    if manifest is not None:
+        for month in prune_partitions(manifest):
+            fingerprint = _partition_fingerprint(table, month)
+            if table == "recs":
+                fingerprint = (fingerprint, _partition_fingerprint("sessions", str(pd.Period(month, freq='M') - 1)),
+                               _partition_fingerprint("sessions", month))
+            yield _partition_counts(table, month, fingerprint)
+        return
+
+    if table == "sessions":
+        for chunk in iter_table("sessions", usecols=_table_columns("sessions")):
+            yield _table_counts(table, chunk)
+        return
+
+    # Not partitioned yet: the session lookup has to cover the whole flat file
+    sessions = pd.concat(
+        [chunk for chunk in iter_table("sessions", usecols=['session_id'] + REC_SESSION_COLUMNS)]
+        or [pd.DataFrame(columns=['session_id'] + REC_SESSION_COLUMNS)],
+        ignore_index=True
+    )
+    for chunk in iter_table("recs", usecols=['session_id', 'clicked']):
+        yield _table_counts(table, _with_session_attributes(chunk, sessions))
+
+
+@st.cache_data(show_spinner=False)
+def compute_daily_counters(version):
+    """Daily counters for every spec over the full history, built once per data version.
+
+    Sessions and recommendation events are counted one month partition at a time, reading only
+    the columns the specs need, and each month's counts are cached on its own files; the monthly
+    counts are then summed into one set of prefix arrays. Sidebar windows, trend panels and
+    comparison periods are all answered from these counters, so none of them reads the raw tables.
+    """
+    counts = {name: [] for name in COUNTER_SPECS}
+    for table in ("sessions", "recs"):
+        for table_counts in _iter_counts(table):
+            for name, frame in table_counts.items():
+                counts[name].append(frame)
+
+    master_df = pd.read_csv("ott_master_dataset.csv", usecols=['country', 'join_date', 'churn_date'],
+                            parse_dates=['join_date', 'churn_date'])
+    master_df['days_to_churn'] = (master_df['churn_date'] - master_df['join_date']).dt.days
+    for name, frame in _table_counts("master", master_df).items():
+        counts[name].append(frame)
+
+    return {
+        name: counters_from_counts(pd.concat(counts[name]), metrics)
+        for name, (_, _, _, metrics) in COUNTER_SPECS.items()
+    }
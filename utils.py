@@ -1,5 +1,16 @@
+import hashlib
+import os
 import pandas as pd
 import streamlit as st
+from partitions import TABLES, MANIFEST_NAME, read_table, latest_timestamp, table_dir
+
+# Sidebar time window label -> lookback from the latest recorded date (None = full history)
+TIME_WINDOWS = {
+    "All Time": None,
+    "Last 30 Days": pd.DateOffset(days=30),
+    "Last Quarter": pd.DateOffset(months=3),
+    "Last 12 Months": pd.DateOffset(months=12),
+}
 
 def ensure_kolkata_tz(dt_series):
     if pd.api.types.is_datetime64_any_dtype(dt_series):
@@ -10,12 +21,57 @@ def ensure_kolkata_tz(dt_series):
     return dt_series
 
 @st.cache_data(show_spinner=False)
-def load_data():
-    """Load and cache the three CSV files with proper timezone handling"""
+def _latest_session(version):
+    return latest_timestamp("sessions")
+
+def data_end():
+    """Latest session date (manifest lookup, or a date-column scan of the flat CSV cached per data version)"""
+    # With no session data at all, round "now" up to the day so the cache key stays stable across reruns
+    return _latest_session(data_version()) or pd.Timestamp.now(tz="Asia/Kolkata").ceil("D")
+
+def window_bounds(label):
+    """Return (start, end) for a sidebar time window, anchored on the latest session date"""
+    offset = TIME_WINDOWS.get(label)
+    if offset is None:
+        return None, None
+    end = data_end()
+    return end - offset, end
+
+def data_version():
+    """Cheap fingerprint of the on-disk data (file sizes and mtimes, no content scan).
+
+    Derived results are cached on this key, so they are recomputed only when the data changes.
+    """
+    paths = ["ott_master_dataset.csv"]
+    for table, (source, _) in TABLES.items():
+        paths += [source, os.path.join(table_dir(table), MANIFEST_NAME)]
+
+    fingerprint = []
+    for path in paths:
+        if os.path.exists(path):
+            stat = os.stat(path)
+            fingerprint.append(f"{path}:{stat.st_size}:{stat.st_mtime_ns}")
+    return hashlib.md5("|".join(fingerprint).encode()).hexdigest()[:12]
+
+def load_data(start=None, end=None):
+    """Load the three datasets for [start, end], cached per data version.
+
+    Keying the cache on data_version() means a change on disk reloads the frames
+    instead of serving stale ones to every derived cache.
+    """
+    return _load_data(data_version(), start, end)
+
+@st.cache_data(show_spinner=False)
+def _load_data(version, start=None, end=None):
+    """Load and cache the three datasets with proper timezone handling.
+
+    Sessions and recommendation events are read from the monthly partition store
+    (see partitions.py), so a bounded [start, end] window only reads the months it needs.
+    """
     
     master_df = pd.read_csv("ott_master_dataset.csv", parse_dates=["join_date", "trial_end_date", "churn_date"])
-    sessions_df = pd.read_csv("ott_sessions_dataset.csv", parse_dates=["session_date"])
-    recs_df = pd.read_csv("ott_recommendation_events.csv", parse_dates=["event_date"])
+    sessions_df = read_table("sessions", start, end)
+    recs_df = read_table("recs", start, end)
     
     # Ensure session_date and other datetimes are tz-aware in Asia/Kolkata
     master_df["join_date"] = ensure_kolkata_tz(master_df["join_date"])
@@ -24,4 +80,4 @@ def load_data():
     sessions_df["session_date"] = ensure_kolkata_tz(sessions_df["session_date"])
     recs_df["event_date"] = ensure_kolkata_tz(recs_df["event_date"])
     
-    return master_df, sessions_df, recs_df 
\ No newline at end of file
+    return master_df, sessions_df, recs_df